@@ -0,0 +1,169 @@
+"""League-Wide Batch Mode for Fantasy Football Roast Agent"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import get_config
+from sleeper_tools import (
+    attach_player_table, export_response_cache, get_player_database, import_response_cache,
+    prefetch_league_data
+)
+from roast_agent import FantasyFootballRoastAgent
+from llm_cache import build_model
+from player_table import publish_player_table
+from report_renderer import render_index, write_output
+from league_context import LeagueContext, current_league, set_current_league, use_league
+from token_accounting import ledger
+from tracing import tracer
+import metrics
+
+config = get_config()
+
+# The agent each process-pool worker reuses for every target it picks up
+_worker_agent: Optional[FantasyFootballRoastAgent] = None
+
+
+def _init_worker(player_table_path: Optional[str], response_cache: Dict[str, tuple], league_fields: Dict[str, Any],
+                 model_options: Dict[str, Any], trace: bool) -> None:
+    """Process-pool initializer: attach the shared player table and build this worker's agent"""
+    global _worker_agent
+    if trace:
+        tracer.enable()
+    if player_table_path:
+        attach_player_table(player_table_path)
+    import_response_cache(response_cache)
+    league = LeagueContext(**league_fields)
+    set_current_league(league)
+    _worker_agent = FantasyFootballRoastAgent(model=build_model(**model_options), league=league)
+
+
+def _roast_in_worker(display_name: str, resume: bool, force: bool) -> Dict[str, Any]:
+    """Generate one report in a worker process.
+
+    Metrics, token usage and trace spans are recorded in the worker's own process, so
+    everything recorded since its previous task is drained and sent back with the result
+    for the parent to merge.
+    """
+    try:
+        report_path, error = _worker_agent.generate_report(display_name, resume=resume, force=force), None
+    except Exception as e:
+        report_path, error = None, str(e)
+    usage = metrics.registry.snapshot()
+    metrics.registry.reset()
+    return {"report_path": report_path, "error": error, "metrics": usage,
+            "turns": ledger.drain(), "spans": tracer.drain()}
+
+
+def _merge_worker_result(result: Dict[str, Any]) -> str:
+    """Fold a worker's metrics, token usage and spans into this process; returns its report path"""
+    metrics.registry.merge(result["metrics"])
+    ledger.merge(result["turns"])
+    tracer.merge(result["spans"])
+    if result["error"]:
+        raise RuntimeError(result["error"])
+    return result["report_path"]
+
+
+def run_league_batch(targets: Optional[List[str]] = None, workers: Optional[int] = None,
+                     resume: bool = True, model=None, force: bool = False,
+                     league: Optional[LeagueContext] = None, processes: Optional[bool] = None,
+                     model_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Roast every manager in the league in one process, sharing league data across targets.
+
+    League-wide data is fetched once up front; each worker thread builds one agent and
+    reuses it (with a fresh conversation) for every target it picks up. Several batches
+    for different leagues can run at once in the same process.
+
+    With processes set, workers are separate processes instead: each builds its own model
+    from model_options (build_model arguments; model is ignored), starts with a copy of the
+    prefetched league responses and maps the shared player table rather than loading the
+    player database itself. Each worker's metrics, token usage and trace spans are merged
+    back into this process as its reports finish.
+    """
+    workers = workers or config["batch_workers"]
+    processes = config["batch_processes"] if processes is None else processes
+    league = league or current_league()
+    with use_league(league):
+        league_info = prefetch_league_data()
+    if not league_info["success"]:
+        raise RuntimeError(f"Failed to get league info: {league_info.get('error')}")
+
+    if targets is None:
+        targets = [u.get("display_name") for u in league_info["data"]["users"] if u.get("display_name")]
+
+    kind = "processes" if processes else "workers"
+    print(f"🏭 Batch roasting {len(targets)} managers in league {league.league_id} with {workers} {kind}...")
+
+    if processes:
+        # Spawned (not forked) workers start clean: no inherited threads and no
+        # copy-on-write copy of this process's player dict to fault in
+        players = get_player_database()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(publish_player_table(players) if players else None, export_response_cache(),
+                      {"league_id": league.league_id, "season": league.season,
+                       "target_display_name": league.target_display_name, "endpoints": dict(league.endpoints)},
+                      model_options or {}, tracer.enabled)
+        )
+        task = partial(_roast_in_worker, resume=resume, force=force)
+    else:
+        local = threading.local()
+
+        def roast(display_name: str) -> str:
+            if not hasattr(local, "agent"):
+                local.agent = FantasyFootballRoastAgent(model=model, league=league)
+            return local.agent.generate_report(display_name, resume=resume, force=force)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        task = roast
+
+    results = []
+    with executor:
+        futures = {executor.submit(task, name): name for name in targets}
+        for future in as_completed(futures):
+            display_name = futures[future]
+            try:
+                outcome = future.result()
+                report_path = _merge_worker_result(outcome) if processes else outcome
+                success = "error_report_" not in Path(report_path).name
+            except Exception as e:
+                print(f"❌ Batch report failed for {display_name}: {e}")
+                report_path, success = None, False
+            results.append({"display_name": display_name, "report_path": report_path, "success": success})
+
+    results.sort(key=lambda r: targets.index(r["display_name"]))
+    index_path = write_index(results, league_info["data"], league)
+    print(f"📚 Index written to: {index_path}")
+    return {"index_path": index_path, "reports": results}
+
+
+def write_index(results: List[Dict[str, Any]], league_data: Dict[str, Any],
+                league: Optional[LeagueContext] = None) -> str:
+    """Write an index page linking every report generated in the batch"""
+    league = league or current_league()
+    output_dir = Path(config["output_dir"])
+    reports = []
+    for result in results:
+        href = ""
+        if result["report_path"]:
+            report_path = Path(result["report_path"])
+            href = report_path.name if report_path.parent == output_dir else report_path.absolute().as_uri()
+        reports.append({**result, "href": href})
+
+    html = render_index(
+        league_name=league_data.get("league_name") or "Fantasy League",
+        season=league_data.get("season") or league.season,
+        reports=reports
+    )
+
+    filename = config["index_filename_format"].format(
+        league_id=league.league_id,
+        timestamp=datetime.now().strftime('%Y%m%d_%H%M%S')
+    )
+    return write_output(output_dir / filename, html)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the markdown to HTML converter
+
+Converts synthetic reports of growing size and prints time per KB; a linear-time
+converter keeps that column roughly flat as the input grows.
+"""
+
+import argparse
+import time
+from markdown_html import markdown_to_html
+
+SAMPLE_SECTION = """## 🔥 Week {n} Roast
+
+Your **starting lineup** scored *less* than the bench again. Bold strategy, <Coach> & co.
+Maybe check the [waiver wire](https://sleeper.com) once in a while.
+
+- **Josh Allen**: 12.4 pts (projected 24.1)
+- `RB2` slot: empty for the *third* week running
+- Traded away a WR1 for "future considerations"
+
+1. Set a lineup
+2. Stop trading with your roommate
+
+> "I'm not worried about my team." - You, in August
+
+| Player | Points | Projected |
+|---|---:|---:|
+| Josh Allen | 12.4 | 24.1 |
+| Bench Guy | 31.0 | 8.2 |
+
+---
+"""
+
+
+def build_report(sections: int) -> str:
+    return "\n".join(SAMPLE_SECTION.format(n=n) for n in range(sections))
+
+
+def time_conversion(content: str, repeat: int) -> float:
+    """Best wall time of `repeat` conversions, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown_to_html(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown to HTML conversion")
+    parser.add_argument("--max-sections", type=int, default=4096, help="Largest report size, in sections")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size (best time is reported)")
+    args = parser.parse_args()
+
+    print("📏 Markdown conversion benchmark")
+    print(f"{'sections':>10} {'size KB':>10} {'time ms':>10} {'µs/KB':>10}")
+
+    sections = 16
+    while sections <= args.max_sections:
+        content = build_report(sections)
+        size_kb = len(content.encode("utf-8")) / 1024
+        elapsed = time_conversion(content, args.repeat)
+        print(f"{sections:>10} {size_kb:>10.1f} {elapsed * 1000:>10.2f} {elapsed * 1e6 / size_kb:>10.1f}")
+        sections *= 4
+
+
+if __name__ == "__main__":
+    main()
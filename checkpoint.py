@@ -0,0 +1,131 @@
+"""Run Checkpointing for Fantasy Football Roast Agent"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from config import get_config
+from tracing import span
+
+config = get_config()
+
+MANIFEST_FILE = "run.json"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write a file through a temp file so a crash never leaves half a checkpoint"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class RunCheckpoint:
+    """Checkpoint store for one report run: data-gathering steps and generated sections"""
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = Path(run_dir)
+        self.steps_dir = self.run_dir / "steps"
+        self.sections_dir = self.run_dir / "sections"
+        self.steps_dir.mkdir(parents=True, exist_ok=True)
+        self.sections_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    @classmethod
+    def open(cls, display_name: str, run_dir: Optional[str] = None, resume: bool = True,
+             league_id: Optional[str] = None) -> "RunCheckpoint":
+        """Open an explicit run directory, resume the latest unfinished run, or start a new one"""
+        league_id = league_id or config["league_id"]
+        if run_dir:
+            checkpoint = cls(Path(run_dir))
+        else:
+            checkpoint = cls._find_resumable(display_name, league_id) if resume else None
+            if checkpoint is None:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                slug = display_name.replace(" ", "_")
+                checkpoint = cls(Path(config["checkpoint_dir"]) / f"{slug}_{league_id}_{timestamp}")
+            else:
+                print(f"♻️  Resuming checkpointed run: {checkpoint.run_dir}")
+
+        checkpoint.manifest.setdefault("target", display_name)
+        checkpoint.manifest.setdefault("league_id", league_id)
+        checkpoint.manifest.setdefault("created_at", datetime.now().isoformat())
+        checkpoint.manifest["status"] = "in_progress"
+        checkpoint._save_manifest()
+        return checkpoint
+
+    @classmethod
+    def _find_resumable(cls, display_name: str, league_id: str) -> Optional["RunCheckpoint"]:
+        """Find the most recent unfinished run for this target and league that is still fresh enough"""
+        root = Path(config["checkpoint_dir"])
+        if not root.exists():
+            return None
+
+        max_age = config["checkpoint_max_age_hours"] * 3600
+        slug = display_name.replace(" ", "_")
+        candidates = sorted(root.glob(f"{slug}_*/{MANIFEST_FILE}"), reverse=True)
+
+        for manifest_path in candidates:
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if manifest.get("target") != display_name or manifest.get("status") == "complete":
+                continue
+            # Runs from before league contexts have no league_id and belong to the configured league
+            if manifest.get("league_id", config["league_id"]) != league_id:
+                continue
+            if time.time() - manifest_path.stat().st_mtime > max_age:
+                continue
+            return cls(manifest_path.parent)
+        return None
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        manifest_path = self.run_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            try:
+                return json.loads(manifest_path.read_text(encoding="utf-8"))
+            except ValueError:
+                pass
+        return {}
+
+    def _save_manifest(self) -> None:
+        _write_atomic(self.run_dir / MANIFEST_FILE, json.dumps(self.manifest, indent=2))
+
+    def step(self, name: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a checkpointed data-gathering result, computing and saving it if missing.
+
+        Only successful results are checkpointed so failed steps are retried on resume.
+        """
+        step_path = self.steps_dir / f"{name}.json"
+        if step_path.exists():
+            try:
+                return json.loads(step_path.read_text(encoding="utf-8"))
+            except ValueError:
+                pass
+
+        with span(f"step:{name}", "phase"):
+            result = fn()
+        if result.get("success"):
+            _write_atomic(step_path, json.dumps(result, indent=2, default=str))
+        return result
+
+    def load_section(self, key: str) -> Optional[str]:
+        """Return previously generated section content, or None if it still needs generating"""
+        section_path = self.sections_dir / f"{key}.md"
+        if section_path.exists():
+            return section_path.read_text(encoding="utf-8")
+        return None
+
+    def save_section(self, key: str, content: str) -> None:
+        """Persist generated section content"""
+        _write_atomic(self.sections_dir / f"{key}.md", content)
+
+    def mark_complete(self, report_path: str) -> None:
+        """Record that the run finished so it will not be resumed again"""
+        self.manifest["status"] = "complete"
+        self.manifest["report_path"] = report_path
+        self.manifest["completed_at"] = datetime.now().isoformat()
+        self._save_manifest()
@@ -14,18 +14,141 @@ TARGET_DISPLAY_NAME = "armanpopli"  # Display name of user to roast
 AWS_REGION = "us-west-2"           # AWS region for Bedrock
 MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"  # Bedrock model
 
+# LLM Response Cache
+LLM_BACKEND = "bedrock"            # "bedrock" or "replay" (offline, recorded responses only)
+LLM_CACHE_ENABLED = True           # Reuse recorded responses for identical model requests
+LLM_CACHE_DIR = "cache/llm"        # Where recorded model responses are stored
+
 # API Configuration
 SLEEPER_API_BASE = "https://api.sleeper.app/v1"
 RATE_LIMIT_DELAY = 0.1  # Delay between API calls (seconds)
+API_CACHE_TTL = 300     # Reuse identical Sleeper responses within this many seconds
+PLAYER_DB_RETRY_AFTER = 30  # Seconds before retrying a failed player database download
+BACKGROUND_WARMUP = True    # Load player DB, NFL state and league data while the agent starts up
+PLAYER_TABLE_PATH = "cache/players.bin"  # Shared player table mapped by process-pool workers
+
+# Resilience Settings (Sleeper API and web search)
+ENDPOINT_TIMEOUTS = {             # (connect, read) timeouts in seconds, per Sleeper endpoint
+    "players": (5, 60),
+    "default": (3.05, 10)
+}
+RETRY_ATTEMPTS = 3                # Attempts per request before giving up
+RETRY_BASE_DELAY = 0.5            # Base for jittered exponential backoff (seconds)
+RETRY_MAX_DELAY = 8.0             # Cap on a single backoff sleep (seconds)
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+HEDGE_AFTER = {                   # Send a second identical request if the first is this slow
+    "nfl_state": 1.0,
+    "league": 2.0,
+    "league_users": 2.0,
+    "league_rosters": 2.0,
+    "league_matchups": 2.0
+}
+CIRCUIT_FAILURE_THRESHOLD = 5     # Consecutive failures before a dependency is cut off
+CIRCUIT_RESET_TIMEOUT = 30        # Seconds before a cut-off dependency is tried again
+WEB_SEARCH_TIMEOUT = 10           # Per-search timeout (seconds)
 
 # Output Configuration
 OUTPUT_DIR = "reports"             # Directory to save HTML reports
-REPORT_FILENAME_FORMAT = "roast_{display_name}_{timestamp}.html"
+REPORT_FILENAME_FORMAT = "roast_{display_name}_{league_id}_{timestamp}.html"
+TEMPLATE_CACHE_DIR = "cache/templates"  # Compiled Jinja template bytecode
+SHARED_REPORT_ASSETS = False       # Write CSS once per output dir as report.<hash>.css instead of inlining it
+REPORT_COMPRESSION = []            # Pre-compressed siblings to write next to each file: "gz", "br" (needs brotli)
 
 # Report Settings
 MAX_WAIVER_TARGETS = 5            # Number of waiver wire recommendations
 MAX_TRADE_SUGGESTIONS = 3         # Number of trade suggestions
 WEB_SEARCH_RESULTS = 5           # Number of web search results per query
+WEB_SEARCH_WORKERS = 6           # Concurrent web searches (shared thread pool)
+WEB_SEARCH_BACKEND = "auto"      # ddgs search backend
+WEB_SEARCH_RATE_LIMITS = {       # Minimum seconds between requests, per search provider
+    "auto": 0.25
+}
+
+# Search query templates, keyed by search kind. {season} and {week} come from the
+# current NFL state; the other fields are the tool's arguments.
+SEARCH_QUERY_TEMPLATES = {
+    "player_news": "{player_name} NFL fantasy football news injury status week {week} {season}",
+    "fantasy_trends": "fantasy football week {week} waiver wire targets {season} NFL trending players",
+    "team_analysis": "{team_name} fantasy football analysis {season} NFL season outlook",
+    "trade_analysis": "{player1} vs {player2} fantasy football trade analysis value comparison {season}",
+    "injury_reports": "NFL injury report week {week} {season} fantasy football impact"
+}
+SEARCH_CONTEXT_TTL = 3600         # Re-check the current NFL week at most this often (seconds)
+SEARCH_CONTEXT_RETRY_AFTER = 30   # ...or this soon when the NFL state couldn't be fetched
+
+# Web Search Cache
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_PATH = "cache/search_cache.sqlite"
+SEARCH_CACHE_TTLS = {             # Seconds a cached result stays fresh, per search kind
+    "injury_reports": 2 * 3600,
+    "player_news": 6 * 3600,
+    "fantasy_trends": 12 * 3600,
+    "trade_analysis": 24 * 3600,
+    "team_analysis": 3 * 24 * 3600,
+    "default": 6 * 3600
+}
+SEARCH_CACHE_MAX_STALE = 7 * 24 * 3600  # Oldest result served when the provider errors
+
+# Snippet Post-Processing
+SNIPPET_TOKEN_BUDGET = 600        # Max (estimated) tokens of results returned per search
+SNIPPET_DEDUP_THRESHOLD = 0.6     # MinHash similarity above which snippets are near-duplicates
+
+# Local News Index
+NEWS_INDEX_ENABLED = True         # Store every collected snippet in a local full-text index
+NEWS_INDEX_PATH = "cache/news_index.sqlite"
+NEWS_INDEX_MAX_AGE_DAYS = 14      # Ignore stored snippets older than this
+
+# Batch Settings
+BATCH_WORKERS = 4                 # Reports generated concurrently in --all-users mode
+BATCH_PROCESSES = False           # Run --all-users workers as processes instead of threads
+INDEX_FILENAME_FORMAT = "index_{league_id}_{timestamp}.html"
+
+# Service Mode (run_roast.py --serve)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2               # Reports generated concurrently by the service
+SERVICE_REFRESH_INTERVAL = 60     # Seconds between background refreshes of league data
+SERVICE_LEAGUE_IDS = None         # Leagues the service accepts jobs for (None = just LEAGUE_ID)
+SERVICE_MAX_JOBS = 200            # Finished jobs kept for GET /jobs (oldest are dropped)
+
+# Weekly Scheduler (run_roast.py --schedule)
+SCHEDULE_REPORT_TIMES = ["tue 09:00"]  # Local weekday + time to generate reports (after MNF)
+SCHEDULE_PREFETCH_LEAD = 45 * 60  # Prefetch the week's data this many seconds before reports
+SCHEDULE_PIN_SECONDS = 3 * 3600   # Prefetched Sleeper data stays cached this long past report time
+SCHEDULE_JITTER = 10 * 60         # Random delay (up to this many seconds) before each league's run
+SCHEDULE_WORKERS = 2              # Reports generated concurrently per league
+SCHEDULE_MAX_LEAGUES = 1          # Leagues processed concurrently
+SCHEDULE_TARGETS = None           # Managers to roast each week (None = everyone in the league)
+SCHEDULE_SEASON_TYPES = ["regular", "post"]  # NFL season types the scheduler runs in
+SCHEDULE_STATE_PATH = "cache/scheduler_state.json"  # Weeks and targets already reported
+
+# Checkpoint Settings
+CHECKPOINT_DIR = "reports/runs"   # Directory for per-run checkpoints (steps + sections)
+CHECKPOINT_MAX_AGE_HOURS = 12     # Only resume unfinished runs younger than this
+SECTION_MAX_ATTEMPTS = 3          # Attempts per report section before giving up
+
+# Report Catalogue Settings
+REPORT_CATALOG_PATH = "cache/report_catalog.sqlite"  # Every generated report and its input hash
+SKIP_UNCHANGED_REPORTS = True     # Return the existing report when the input data hasn't changed
+CATALOG_VOLATILE_FACTS = ["trending_players"]  # Facts left out of the input hash
+
+# Metrics Settings
+METRICS_JSON = True               # Write metrics_<timestamp>.json to OUTPUT_DIR at the end of a run
+METRICS_PROMETHEUS_FILE = None    # Also write Prometheus text here (e.g. a node_exporter textfile dir)
+
+# Profiling Settings (run_roast.py --profile)
+PROFILE_TOP_N = 30                # Functions / allocation sites listed per stage report
+PROFILE_TRACEBACK_FRAMES = 1      # tracemalloc frames kept per allocation (more = slower)
+
+# Token Accounting
+MODEL_PRICES = {                  # USD per million tokens, keyed by MODEL_ID
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0": {"input": 3.00, "output": 15.00},
+    "us.anthropic.claude-sonnet-4-20250514-v1:0": {"input": 3.00, "output": 15.00},
+    "us.anthropic.claude-3-5-haiku-20241022-v1:0": {"input": 0.80, "output": 4.00}
+}
+
+# Conversation Settings
+CARRY_LEAGUE_CONTEXT = True       # Seed each new target's conversation with a league summary
 
 # =============================================================================
 # CONSTANTS (Don't change these unless you know what you're doing)
@@ -57,6 +180,26 @@ POSITION_GROUPS = {
     "DEF": ["DEF"]
 }
 
+# NFL team abbreviations (as used by Sleeper) and the names they appear under in news
+NFL_TEAMS = {
+    "ARI": ["Cardinals", "Arizona Cardinals"], "ATL": ["Falcons", "Atlanta Falcons"],
+    "BAL": ["Ravens", "Baltimore Ravens"], "BUF": ["Bills", "Buffalo Bills"],
+    "CAR": ["Panthers", "Carolina Panthers"], "CHI": ["Bears", "Chicago Bears"],
+    "CIN": ["Bengals", "Cincinnati Bengals"], "CLE": ["Browns", "Cleveland Browns"],
+    "DAL": ["Cowboys", "Dallas Cowboys"], "DEN": ["Broncos", "Denver Broncos"],
+    "DET": ["Lions", "Detroit Lions"], "GB": ["Packers", "Green Bay Packers"],
+    "HOU": ["Texans", "Houston Texans"], "IND": ["Colts", "Indianapolis Colts"],
+    "JAX": ["Jaguars", "Jacksonville Jaguars"], "KC": ["Chiefs", "Kansas City Chiefs"],
+    "LV": ["Raiders", "Las Vegas Raiders"], "LAC": ["Chargers", "Los Angeles Chargers"],
+    "LAR": ["Rams", "Los Angeles Rams"], "MIA": ["Dolphins", "Miami Dolphins"],
+    "MIN": ["Vikings", "Minnesota Vikings"], "NE": ["Patriots", "New England Patriots"],
+    "NO": ["Saints", "New Orleans Saints"], "NYG": ["Giants", "New York Giants"],
+    "NYJ": ["Jets", "New York Jets"], "PHI": ["Eagles", "Philadelphia Eagles"],
+    "PIT": ["Steelers", "Pittsburgh Steelers"], "SF": ["49ers", "San Francisco 49ers"],
+    "SEA": ["Seahawks", "Seattle Seahawks"], "TB": ["Buccaneers", "Tampa Bay Buccaneers"],
+    "TEN": ["Titans", "Tennessee Titans"], "WAS": ["Commanders", "Washington Commanders"]
+}
+
 # Scoring weights for player value analysis (PPR)
 PPR_WEIGHTS = {
     "passing_yards": 0.04,
@@ -78,14 +221,79 @@ def get_config():
         "target_display_name": TARGET_DISPLAY_NAME,
         "aws_region": AWS_REGION,
         "model_id": MODEL_ID,
+        "llm_backend": LLM_BACKEND,
+        "llm_cache_enabled": LLM_CACHE_ENABLED,
+        "llm_cache_dir": LLM_CACHE_DIR,
         "sleeper_api_base": SLEEPER_API_BASE,
         "rate_limit_delay": RATE_LIMIT_DELAY,
+        "api_cache_ttl": API_CACHE_TTL,
+        "player_db_retry_after": PLAYER_DB_RETRY_AFTER,
+        "background_warmup": BACKGROUND_WARMUP,
+        "player_table_path": PLAYER_TABLE_PATH,
+        "endpoint_timeouts": ENDPOINT_TIMEOUTS,
+        "retry_attempts": RETRY_ATTEMPTS,
+        "retry_base_delay": RETRY_BASE_DELAY,
+        "retry_max_delay": RETRY_MAX_DELAY,
+        "retry_statuses": RETRY_STATUSES,
+        "hedge_after": HEDGE_AFTER,
+        "circuit_failure_threshold": CIRCUIT_FAILURE_THRESHOLD,
+        "circuit_reset_timeout": CIRCUIT_RESET_TIMEOUT,
+        "web_search_timeout": WEB_SEARCH_TIMEOUT,
         "output_dir": OUTPUT_DIR,
         "report_filename_format": REPORT_FILENAME_FORMAT,
+        "template_cache_dir": TEMPLATE_CACHE_DIR,
+        "shared_report_assets": SHARED_REPORT_ASSETS,
+        "report_compression": REPORT_COMPRESSION,
         "max_waiver_targets": MAX_WAIVER_TARGETS,
         "max_trade_suggestions": MAX_TRADE_SUGGESTIONS,
         "web_search_results": WEB_SEARCH_RESULTS,
+        "web_search_workers": WEB_SEARCH_WORKERS,
+        "web_search_backend": WEB_SEARCH_BACKEND,
+        "web_search_rate_limits": WEB_SEARCH_RATE_LIMITS,
+        "search_query_templates": SEARCH_QUERY_TEMPLATES,
+        "search_context_ttl": SEARCH_CONTEXT_TTL,
+        "search_context_retry_after": SEARCH_CONTEXT_RETRY_AFTER,
+        "search_cache_enabled": SEARCH_CACHE_ENABLED,
+        "search_cache_path": SEARCH_CACHE_PATH,
+        "search_cache_ttls": SEARCH_CACHE_TTLS,
+        "search_cache_max_stale": SEARCH_CACHE_MAX_STALE,
+        "snippet_token_budget": SNIPPET_TOKEN_BUDGET,
+        "snippet_dedup_threshold": SNIPPET_DEDUP_THRESHOLD,
+        "news_index_enabled": NEWS_INDEX_ENABLED,
+        "news_index_path": NEWS_INDEX_PATH,
+        "news_index_max_age_days": NEWS_INDEX_MAX_AGE_DAYS,
+        "batch_workers": BATCH_WORKERS,
+        "batch_processes": BATCH_PROCESSES,
+        "service_host": SERVICE_HOST,
+        "service_port": SERVICE_PORT,
+        "service_workers": SERVICE_WORKERS,
+        "service_refresh_interval": SERVICE_REFRESH_INTERVAL,
+        "service_league_ids": SERVICE_LEAGUE_IDS,
+        "service_max_jobs": SERVICE_MAX_JOBS,
+        "schedule_report_times": SCHEDULE_REPORT_TIMES,
+        "schedule_prefetch_lead": SCHEDULE_PREFETCH_LEAD,
+        "schedule_pin_seconds": SCHEDULE_PIN_SECONDS,
+        "schedule_jitter": SCHEDULE_JITTER,
+        "schedule_workers": SCHEDULE_WORKERS,
+        "schedule_max_leagues": SCHEDULE_MAX_LEAGUES,
+        "schedule_targets": SCHEDULE_TARGETS,
+        "schedule_season_types": SCHEDULE_SEASON_TYPES,
+        "schedule_state_path": SCHEDULE_STATE_PATH,
+        "index_filename_format": INDEX_FILENAME_FORMAT,
+        "checkpoint_dir": CHECKPOINT_DIR,
+        "checkpoint_max_age_hours": CHECKPOINT_MAX_AGE_HOURS,
+        "section_max_attempts": SECTION_MAX_ATTEMPTS,
+        "report_catalog_path": REPORT_CATALOG_PATH,
+        "skip_unchanged_reports": SKIP_UNCHANGED_REPORTS,
+        "catalog_volatile_facts": CATALOG_VOLATILE_FACTS,
+        "metrics_json": METRICS_JSON,
+        "metrics_prometheus_file": METRICS_PROMETHEUS_FILE,
+        "profile_top_n": PROFILE_TOP_N,
+        "profile_traceback_frames": PROFILE_TRACEBACK_FRAMES,
+        "model_prices": MODEL_PRICES,
+        "carry_league_context": CARRY_LEAGUE_CONTEXT,
         "endpoints": ENDPOINTS,
         "position_groups": POSITION_GROUPS,
+        "nfl_teams": NFL_TEAMS,
         "ppr_weights": PPR_WEIGHTS
     } 
\ No newline at end of file
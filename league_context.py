@@ -0,0 +1,71 @@
+"""League Context for Fantasy Football Roast Agent
+
+Everything that identifies one league - its ID, season, endpoint templates and the HTTP
+client used to reach them - lives in a LeagueContext instead of module-level config, so
+one process can serve many leagues at once.
+
+The active context is held in a context variable. The agent sets it around each report,
+and strands copies it into the threads that run model turns and tools, so @tool
+functions (whose arguments are chosen by the model) pick up their league without
+having to be told. Leagues share the player database, the pooled HTTP session and the
+URL-keyed response cache; league-specific data stays separate because its URLs differ.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+import requests
+from config import get_config
+
+config = get_config()
+
+# One pooled HTTP session shared by every league (connection reuse across tenants)
+shared_session = requests.Session()
+shared_session.headers.update({
+    'User-Agent': 'Fantasy Football Roast Agent',
+    'Accept': 'application/json'
+})
+
+
+@dataclass(frozen=True)
+class LeagueContext:
+    """One league's identity, endpoints and HTTP client"""
+
+    league_id: str
+    season: str = config["season"]
+    target_display_name: Optional[str] = None
+    endpoints: Dict[str, str] = field(default_factory=lambda: dict(config["endpoints"]))
+    session: requests.Session = field(default=shared_session, compare=False, repr=False)
+
+    def url(self, endpoint: str, **params) -> str:
+        """Fill an endpoint template for this league"""
+        return self.endpoints[endpoint].format(league_id=self.league_id, **params)
+
+
+_default_league = LeagueContext(
+    league_id=config["league_id"],
+    season=config["season"],
+    target_display_name=config["target_display_name"]
+)
+_current_league: contextvars.ContextVar = contextvars.ContextVar("current_league", default=None)
+
+
+def current_league() -> LeagueContext:
+    """The league the current report (or thread) is working on; defaults to config.py's league"""
+    return _current_league.get() or _default_league
+
+
+def set_current_league(league: LeagueContext) -> None:
+    """Make league the default for the current context (e.g. for the rest of a CLI run)"""
+    _current_league.set(league)
+
+
+@contextmanager
+def use_league(league: LeagueContext) -> Iterator[LeagueContext]:
+    """Run the wrapped block against the given league"""
+    token = _current_league.set(league)
+    try:
+        yield league
+    finally:
+        _current_league.reset(token)
@@ -0,0 +1,233 @@
+"""LLM Response Cache and Offline Replay Model for Fantasy Football Roast Agent"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from strands.models import BedrockModel
+from strands.models.model import Model
+from config import get_config
+import metrics
+
+config = get_config()
+
+
+class ReplayMissError(Exception):
+    """Raised when the replay model has no recording for a request"""
+
+
+# Stream arguments that carry per-call state rather than shaping the response
+_STATE_KWARGS = {"invocation_state", "model_state", "cancel_signal", "agent_metadata"}
+
+# The system prompt embeds today's date; it's masked so keys survive midnight
+_DATE_PATTERN = re.compile(
+    r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)"
+    r" \d{1,2}, \d{4}\b"
+)
+
+
+def _mask_dates(value: Any) -> Any:
+    """value (a prompt string or content blocks) with calendar dates replaced by a placeholder"""
+    if isinstance(value, str):
+        return _DATE_PATTERN.sub("<date>", value)
+    if isinstance(value, list):
+        return [_mask_dates(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _mask_dates(v) for k, v in value.items()}
+    return value
+
+
+def cache_key(model_id: str, messages: List[Dict], tool_specs: Optional[List[Dict]],
+              system_prompt: Optional[str], **options: Any) -> str:
+    """Content hash of everything that determines a model response.
+
+    The messages include every tool result already in context, so any change in the
+    underlying data produces a different key. Response-shaping options (tool_choice,
+    system_prompt_content, ...) are part of the key; per-call state is not. Dates in the
+    system prompt are masked - the week being reported on is already in the tool results.
+    """
+    payload = json.dumps({
+        "model_id": model_id,
+        "system_prompt": _mask_dates(system_prompt),
+        "messages": messages,
+        "tool_specs": tool_specs or [],
+        "options": {k: _mask_dates(v) for k, v in options.items() if k not in _STATE_KWARGS and v is not None},
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def structured_cache_key(model_id: str, output_model: Any, prompt: List[Dict],
+                         system_prompt: Optional[str], **options: Any) -> str:
+    """Cache key for a structured-output request: the stream key plus the output schema"""
+    schema = output_model.model_json_schema() if hasattr(output_model, "model_json_schema") else str(output_model)
+    return cache_key(model_id, prompt, None, system_prompt, output_schema=schema, **options)
+
+
+def _record_structured(event: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe copy of a structured-output event (the final output becomes a plain dict)"""
+    output = event.get("output")
+    if output is not None and hasattr(output, "model_dump"):
+        return {"output": output.model_dump(mode="json")}
+    return event
+
+
+def _replay_structured(event: Dict[str, Any], output_model: Any) -> Dict[str, Any]:
+    """Inverse of _record_structured: rebuild the output model from the recorded dict"""
+    if "output" in event and isinstance(event["output"], dict):
+        return {"output": output_model.model_validate(event["output"])}
+    return event
+
+
+def _mark_cached(event: Dict[str, Any]) -> Dict[str, Any]:
+    """A replayed event; the usage metadata is flagged so token accounting doesn't bill it"""
+    if "metadata" not in event:
+        return event
+    metadata = event["metadata"]
+    return {"metadata": {**metadata, "metrics": {**metadata.get("metrics", {}), "cached": True}}}
+
+
+class ResponseStore:
+    """On-disk store of recorded model stream events, one JSON file per cache key"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or config["llm_cache_dir"])
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["events"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key: str, model_id: str, events: List[Dict[str, Any]]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "model_id": model_id,
+                "recorded_at": datetime.now().isoformat(),
+                "events": events
+            }, f, default=str)
+        os.replace(tmp_path, path)
+
+
+class CachingModel(Model):
+    """Wraps a model and serves repeated requests from the on-disk response cache"""
+
+    def __init__(self, inner: Model, model_id: str, store: Optional[ResponseStore] = None):
+        self.inner = inner
+        self.model_id = model_id
+        self.store = store or ResponseStore()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # The model is shared by every agent and worker thread
+
+    def update_config(self, **model_config: Any) -> None:
+        self.inner.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.inner.get_config()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.inc("roast_cache_requests_total", cache="llm", result="hit" if hit else "miss")
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs) -> AsyncGenerator[Dict, None]:
+        key = structured_cache_key(self.model_id, output_model, prompt, system_prompt, **kwargs)
+        cached = self.store.load(key)
+        if cached is not None:
+            self._count(hit=True)
+            for event in cached:
+                yield _mark_cached(_replay_structured(event, output_model))
+            return
+
+        self._count(hit=False)
+        events = []
+        async for event in self.inner.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs):
+            events.append(_record_structured(event))
+            yield event
+        self.store.save(key, self.model_id, events)
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncGenerator[Dict, None]:
+        key = cache_key(self.model_id, messages, tool_specs, system_prompt, **kwargs)
+        cached = self.store.load(key)
+        if cached is not None:
+            self._count(hit=True)
+            for event in cached:
+                yield _mark_cached(event)
+            return
+
+        self._count(hit=False)
+        events = []
+        async for event in self.inner.stream(messages, tool_specs, system_prompt, **kwargs):
+            events.append(event)
+            yield event
+
+        # Only complete responses reach this point, so partial streams are never cached
+        self.store.save(key, self.model_id, events)
+
+
+class ReplayModel(Model):
+    """Local stand-in model that deterministically replays recorded responses.
+
+    Recordings come from the same store CachingModel writes to, so any run made with
+    the cache enabled can be replayed (and benchmarked) offline with no Bedrock access.
+    """
+
+    def __init__(self, model_id: str, store: Optional[ResponseStore] = None):
+        self.model_id = model_id
+        self.store = store or ResponseStore()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.model_id = model_config.get("model_id", self.model_id)
+
+    def get_config(self) -> Any:
+        return {"model_id": self.model_id}
+
+    def _load(self, key: str) -> List[Dict[str, Any]]:
+        events = self.store.load(key)
+        if events is None:
+            raise ReplayMissError(f"No recorded response for request {key[:12]} - run once online to record it")
+        return events
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs) -> AsyncGenerator[Dict, None]:
+        key = structured_cache_key(self.model_id, output_model, prompt, system_prompt, **kwargs)
+        for event in self._load(key):
+            yield _mark_cached(_replay_structured(event, output_model))
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncGenerator[Dict, None]:
+        key = cache_key(self.model_id, messages, tool_specs, system_prompt, **kwargs)
+        for event in self._load(key):
+            yield _mark_cached(event)
+
+
+def build_model(backend: Optional[str] = None, use_cache: Optional[bool] = None) -> Model:
+    """Build the agent's model from config: Bedrock (optionally cached) or offline replay"""
+    backend = backend or config["llm_backend"]
+    use_cache = config["llm_cache_enabled"] if use_cache is None else use_cache
+    model_id = config["model_id"]
+
+    if backend == "replay":
+        return ReplayModel(model_id)
+    if backend != "bedrock":
+        raise ValueError(f"Unknown LLM backend: {backend}")
+
+    model = BedrockModel(model_id=model_id, region_name=config["aws_region"])
+    if use_cache:
+        return CachingModel(model, model_id)
+    return model
@@ -0,0 +1,187 @@
+"""Markdown to HTML Conversion for Fantasy Football Roast Agent
+
+A single-pass, line-oriented state machine for the markdown subset the agent writes:
+headings, paragraphs, bullet and numbered lists, blockquotes, rules, fenced code,
+pipe tables and inline code/bold/italic/links. All text is HTML-escaped.
+"""
+
+import re
+from html import escape
+from typing import List, Optional
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_BULLET_RE = re.compile(r"^[-*+]\s+(.*)$")
+_ORDERED_RE = re.compile(r"^\d{1,9}[.)]\s+(.*)$")
+_RULE_RE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})$")
+_TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?$")
+
+# One alternation so each line is scanned once; code spans win over emphasis
+_INLINE_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\*\*(?P<bold>[^*]+?)\*\*"
+    r"|__(?P<bold2>[^_]+?)__"
+    r"|\*(?P<em>[^*\s](?:[^*]*?[^*\s])?)\*"
+    r"|(?<![\w])_(?P<em2>[^_\s](?:[^_]*?[^_\s])?)_(?![\w])"
+    r"|\[(?P<text>[^\]]+)\]\((?P<url>[^)\s]+)\)"
+)
+_SCHEME_RE = re.compile(r"^([a-z][a-z0-9+.-]*):", re.IGNORECASE)
+_SAFE_SCHEMES = {"http", "https", "mailto"}
+NEWLINE = "\n"
+
+
+def _inline_match(match: re.Match) -> str:
+    group = match.lastgroup
+    if group == "code":
+        return f"<code>{match.group('code')}</code>"
+    if group in ("bold", "bold2"):
+        return f"<strong>{render_inline(match.group(group), escaped=True)}</strong>"
+    if group in ("em", "em2"):
+        return f"<em>{render_inline(match.group(group), escaped=True)}</em>"
+
+    text = render_inline(match.group("text"), escaped=True)
+    url = match.group("url")
+    scheme = _SCHEME_RE.match(url)
+    if scheme and scheme.group(1).lower() not in _SAFE_SCHEMES:
+        return text
+    return f'<a href="{url}">{text}</a>'
+
+
+def render_inline(text: str, escaped: bool = False) -> str:
+    """Render inline markdown in one line of text"""
+    if not escaped:
+        text = escape(text)
+    return _INLINE_RE.sub(_inline_match, text)
+
+
+def _split_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|"):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split("|")]
+
+
+class _Converter:
+    """Holds the open block (paragraph, list, quote, table or code) while lines stream through"""
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.block: Optional[str] = None
+        self.buffer: List[str] = []
+        self.pending_header: Optional[str] = None
+
+    def close(self) -> None:
+        block, out = self.block, self.out
+        if block == "p":
+            out.append(f"<p>{render_inline(NEWLINE.join(self.buffer))}</p>")
+        elif block == "blockquote":
+            out.append(f"<blockquote><p>{render_inline(NEWLINE.join(self.buffer))}</p></blockquote>")
+        elif block in ("ul", "ol"):
+            items = "".join(f"<li>{render_inline(item)}</li>" for item in self.buffer)
+            out.append(f"<{block}>{items}</{block}>")
+        elif block == "table":
+            out.append("</tbody></table>")
+        elif block == "code":
+            out.append(f"<pre><code>{escape(NEWLINE.join(self.buffer))}</code></pre>")
+        if self.pending_header is not None:
+            out.append(f"<p>{render_inline(self.pending_header)}</p>")
+            self.pending_header = None
+        self.block = None
+        self.buffer = []
+
+    def open(self, block: str) -> None:
+        if self.block != block:
+            self.close()
+            self.block = block
+
+    def feed(self, raw: str) -> None:
+        if self.block == "code":
+            if raw.strip().startswith("```"):
+                self.close()
+            else:
+                self.buffer.append(raw)
+            return
+
+        line = raw.strip()
+
+        # A "| a | b |" line is held back until we know whether the next line is a separator
+        if self.pending_header is not None:
+            header, self.pending_header = self.pending_header, None
+            if _TABLE_SEPARATOR_RE.match(line):
+                self.close()
+                cells = "".join(f"<th>{render_inline(cell)}</th>" for cell in _split_row(header))
+                self.out.append(f"<table><thead><tr>{cells}</tr></thead><tbody>")
+                self.block = "table"
+                return
+            self.open("p")
+            self.buffer.append(header)
+
+        if not line:
+            self.close()
+            return
+
+        if self.block == "table" and line.startswith("|"):
+            cells = "".join(f"<td>{render_inline(cell)}</td>" for cell in _split_row(line))
+            self.out.append(f"<tr>{cells}</tr>")
+            return
+
+        if line.startswith("```"):
+            self.close()
+            self.block = "code"
+            return
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            self.close()
+            level = len(heading.group(1))
+            self.out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            return
+
+        if _RULE_RE.match(line):
+            self.close()
+            self.out.append("<hr>")
+            return
+
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            self.open("ul")
+            self.buffer.append(bullet.group(1))
+            return
+
+        ordered = _ORDERED_RE.match(line)
+        if ordered:
+            self.open("ol")
+            self.buffer.append(ordered.group(1))
+            return
+
+        if line.startswith(">"):
+            self.open("blockquote")
+            self.buffer.append(line[1:].lstrip())
+            return
+
+        if line.startswith("|") and line.count("|") >= 2:
+            if self.block not in ("p", None):
+                self.close()
+            self.pending_header = line
+            return
+
+        # Lazy continuation: an unmarked line right after a list item extends that item
+        if self.block in ("ul", "ol") and raw[:1].isspace():
+            self.buffer[-1] += " " + line
+            return
+
+        self.open("p")
+        self.buffer.append(line)
+
+    def finish(self) -> str:
+        self.close()
+        return "\n".join(self.out)
+
+
+def markdown_to_html(content: str) -> str:
+    """Convert agent-written markdown to HTML in a single pass over the lines"""
+    converter = _Converter()
+    for line in content.splitlines():
+        converter.feed(line)
+    return converter.finish()
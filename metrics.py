@@ -0,0 +1,276 @@
+"""Run Metrics for Fantasy Football Roast Agent
+
+A small in-process metrics registry: counters and latency/size histograms keyed by
+name and labels. Sleeper API calls, web searches, caches, agent tool calls and model
+calls all record into the shared registry, which can be exported as JSON at the end
+of a run or as Prometheus text for long-running deployments.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from strands.hooks import (
+    AfterModelCallEvent, AfterToolCallEvent, BeforeModelCallEvent, BeforeToolCallEvent,
+    HookProvider, HookRegistry
+)
+
+# Seconds; wide enough for sub-millisecond cache hits up to multi-minute model turns
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: cumulative `le` buckets plus sum and count)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        total, out = 0, []
+        for count in self.counts:
+            total += count
+            out.append(total)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None if empty or past the last bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets, self.cumulative()):
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add a histogram exported with to_dict() (same buckets) into this one"""
+        previous = 0
+        for i, bound in enumerate(self.buckets):
+            cumulative = data["buckets"].get(str(bound), previous)
+            self.counts[i] += cumulative - previous
+            previous = cumulative
+        self.sum += data["sum"]
+        self.count += data["count"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.cumulative())}
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the wrapped block's wall time in the `name` histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Add another registry's snapshot() (e.g. from a batch worker process) into this one"""
+        with self._lock:
+            for name, rows in snapshot.get("counters", {}).items():
+                series = self._counters.setdefault(name, {})
+                for row in rows:
+                    key = _labels(row["labels"])
+                    series[key] = series.get(key, 0) + row["value"]
+            for name, rows in snapshot.get("histograms", {}).items():
+                series = self._histograms.setdefault(name, {})
+                for row in rows:
+                    key = _labels(row["labels"])
+                    if key not in series:
+                        series[key] = Histogram()
+                    series[key].merge(row)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain data: {"counters": {name: [...]}, "histograms": {name: [...]}}"""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration": round(time.time() - self.started_at, 3),
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                    for name, series in sorted(self._counters.items())
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **hist.to_dict()} for key, hist in sorted(series.items())]
+                    for name, series in sorted(self._histograms.items())
+                }
+            }
+
+    def write_json(self, path: Path) -> str:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return str(path)
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        def fmt(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{fmt(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in sorted(series.items()):
+                    for bound, cumulative in zip(hist.buckets, hist.cumulative()):
+                        lines.append(f"{name}_bucket{fmt(labels, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{fmt(labels, (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{name}_sum{fmt(labels)} {hist.sum}")
+                    lines.append(f"{name}_count{fmt(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    registry.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    registry.observe(name, value, **labels)
+
+
+def timer(name: str, **labels: Any):
+    return registry.timer(name, **labels)
+
+
+def _reports_failure(content: List[Dict[str, Any]]) -> bool:
+    """Our tools report handled failures as {"success": False, ...} rather than raising"""
+    for block in content:
+        data = block.get("json")
+        if data is None and block.get("text", "").startswith("{"):
+            try:
+                data = json.loads(block["text"])
+            except ValueError:
+                continue
+        if isinstance(data, dict) and data.get("success") is False:
+            return True
+    return False
+
+
+def record_tool_call(tool_name: str, content: List[Dict[str, Any]], failed: bool,
+                     seconds: Optional[float] = None) -> None:
+    """Record one finished tool call: outcome, latency and result size"""
+    inc("roast_tool_calls_total", tool=tool_name, status="error" if failed else "success")
+    if seconds is not None:
+        observe("roast_tool_call_seconds", seconds, tool=tool_name)
+    inc("roast_tool_result_bytes_total", len(json.dumps(content, default=str).encode("utf-8")), tool=tool_name)
+
+
+def call_tool(tool_fn: Any, *args: Any, **kwargs: Any) -> Any:
+    """Call a tool directly (outside the agent loop), recording it the way MetricsHooks would"""
+    tool_name = getattr(tool_fn, "tool_name", getattr(tool_fn, "__name__", "unknown"))
+    start = time.perf_counter()
+    result = None
+    try:
+        result = tool_fn(*args, **kwargs)
+        return result
+    finally:
+        content = [] if result is None else [{"json": result}]
+        failed = result is None or _reports_failure(content)
+        record_tool_call(tool_name, content, failed, time.perf_counter() - start)
+
+
+class MetricsHooks(HookProvider):
+    """Agent hooks recording every tool call and model call the agent makes"""
+
+    def __init__(self):
+        self._tool_starts: Dict[str, float] = {}
+        self._model_starts: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeToolCallEvent, self.before_tool)
+        registry.add_callback(AfterToolCallEvent, self.after_tool)
+        registry.add_callback(BeforeModelCallEvent, self.before_model)
+        registry.add_callback(AfterModelCallEvent, self.after_model)
+
+    def before_tool(self, event: BeforeToolCallEvent) -> None:
+        with self._lock:
+            self._tool_starts[event.tool_use["toolUseId"]] = time.perf_counter()
+
+    def after_tool(self, event: AfterToolCallEvent) -> None:
+        with self._lock:
+            start = self._tool_starts.pop(event.tool_use["toolUseId"], None)
+        result = event.result or {}
+        content = result.get("content", [])
+        failed = event.exception is not None or result.get("status") == "error" or _reports_failure(content)
+        record_tool_call(event.tool_use["name"], content, failed,
+                         None if start is None else time.perf_counter() - start)
+
+    def before_model(self, event: BeforeModelCallEvent) -> None:
+        with self._lock:
+            self._model_starts[id(event.agent)] = time.perf_counter()
+
+    def after_model(self, event: AfterModelCallEvent) -> None:
+        with self._lock:
+            start = self._model_starts.pop(id(event.agent), None)
+        inc("roast_model_calls_total", status="error" if event.exception else "success")
+        if start is not None:
+            observe("roast_model_call_seconds", time.perf_counter() - start)
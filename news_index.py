@@ -0,0 +1,165 @@
+"""Local Full-Text News Index for Fantasy Football Roast Agent"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config import get_config
+from sleeper_tools import get_player_database
+
+config = get_config()
+
+_WORD_RE = re.compile(r"[A-Za-z0-9'.]+")
+
+
+class NewsIndex:
+    """SQLite FTS5 index of every news snippet collected by the web tools.
+
+    Snippets are tagged with the Sleeper player IDs and NFL teams they mention so
+    later reports can answer news questions locally, ranked with BM25.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config["news_index_path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS news USING fts5(
+                title, snippet, player_ids, teams,
+                url UNINDEXED, source UNINDEXED, query UNINDEXED, collected_at UNINDEXED
+            );
+            CREATE TABLE IF NOT EXISTS news_urls (url TEXT PRIMARY KEY);
+        """)
+        self._conn.commit()
+        self._names: Optional[Dict[Tuple[str, ...], Tuple[str, str]]] = None
+        self._names_source: Optional[Any] = None  # The player database the names were built from
+        self._team_names: Dict[Tuple[str, ...], str] = {
+            tuple(name.lower().split()): abbr
+            for abbr, names in config["nfl_teams"].items() for name in names
+        }
+
+    def _player_names(self) -> Dict[Tuple[str, ...], Tuple[str, str]]:
+        """Map lowercased full-name tokens to (player_id, team) for rostered NFL players.
+
+        Rebuilt whenever the player database is swapped (e.g. by refresh_player_database);
+        nothing is cached while the database isn't loaded, so tagging starts once it is.
+        """
+        players = get_player_database()
+        if self._names is not None and self._names_source is players:
+            return self._names
+        names = {}
+        for player_id, player in players.items():
+            if not player.get("team") or not player.get("first_name") or not player.get("last_name"):
+                continue
+            key = tuple(f"{player['first_name']} {player['last_name']}".lower().split())
+            names[key] = (player_id, player["team"])
+        if names:
+            self._names, self._names_source = names, players
+        return names
+
+    def tag(self, text: str) -> Tuple[List[str], List[str]]:
+        """Find the player IDs and team abbreviations mentioned in a piece of text"""
+        words = [w.strip(".'").lower() for w in _WORD_RE.findall(text)]
+        names = self._player_names()
+        player_ids, teams = set(), set()
+
+        for size in (1, 2, 3):
+            for i in range(len(words) - size + 1):
+                gram = tuple(words[i:i + size])
+                if gram in names:
+                    player_id, team = names[gram]
+                    player_ids.add(player_id)
+                    teams.add(team)
+                if gram in self._team_names:
+                    teams.add(self._team_names[gram])
+        return sorted(player_ids), sorted(teams)
+
+    def add(self, query: str, results: List[Dict[str, Any]]) -> int:
+        """Index raw search results, skipping URLs already stored; returns how many were added.
+
+        Tagging (which may load the player database) runs outside the lock; only the
+        SQLite reads and writes are serialised.
+        """
+        candidates = {}
+        for result in results:
+            url = result.get("href") or result.get("url", "")
+            if url and url not in candidates:
+                candidates[url] = result
+        with self._lock:
+            for url in list(candidates):
+                if self._conn.execute("SELECT 1 FROM news_urls WHERE url = ?", (url,)).fetchone():
+                    del candidates[url]
+
+        rows = []
+        for url, result in candidates.items():
+            title = result.get("title", "")
+            snippet = result.get("body") or result.get("snippet", "")
+            player_ids, teams = self.tag(f"{title} {snippet}")
+            rows.append((title, snippet, " ".join(player_ids), " ".join(teams), url,
+                         url.split("//")[-1].split("/")[0], query, time.time()))
+
+        added = 0
+        with self._lock:
+            for row in rows:
+                # Another thread may have stored the URL while this one was tagging
+                if self._conn.execute("INSERT OR IGNORE INTO news_urls (url) VALUES (?)", (row[4],)).rowcount == 0:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO news (title, snippet, player_ids, teams, url, source, query, collected_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+                added += 1
+            self._conn.commit()
+        return added
+
+    def search(self, topic: str = "", player_id: Optional[str] = None, team: Optional[str] = None,
+               limit: int = 5) -> List[Dict[str, Any]]:
+        """Rank stored snippets with BM25 for a topic, optionally restricted to a player or team"""
+        clauses = []
+        terms = [w.replace('"', "") for w in _WORD_RE.findall(topic)]
+        if terms:
+            clauses.append("(" + " OR ".join(f'"{term}"' for term in terms) + ")")
+        if player_id:
+            clauses.append(f'player_ids:"{player_id}"')
+        if team:
+            clauses.append(f'teams:"{team.upper()}"')
+        if not clauses:
+            return []
+
+        max_age = config["news_index_max_age_days"] * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, snippet, url, source, collected_at, bm25(news) AS rank FROM news "
+                "WHERE news MATCH ? AND collected_at >= ? ORDER BY rank LIMIT ?",
+                (" AND ".join(clauses), time.time() - max_age, limit)
+            ).fetchall()
+
+        return [{
+            "title": title,
+            "snippet": snippet,
+            "url": url,
+            "source": source,
+            "collected_at": time.strftime('%Y-%m-%d %H:%M', time.localtime(float(collected_at)))
+        } for title, snippet, url, source, collected_at, _ in rows]
+
+    def find_player_id(self, player_name: str) -> Optional[str]:
+        """Resolve a player name to a Sleeper player ID using the tag dictionary"""
+        entry = self._player_names().get(tuple(player_name.lower().split()))
+        return entry[0] if entry else None
+
+
+_news_index: Optional[NewsIndex] = None
+_news_index_lock = threading.Lock()
+
+
+def get_news_index() -> NewsIndex:
+    """Get the shared news index, creating it on first use"""
+    global _news_index
+
+    with _news_index_lock:
+        if _news_index is None:
+            _news_index = NewsIndex()
+    return _news_index
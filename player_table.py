@@ -0,0 +1,199 @@
+"""Shared Player Table for Fantasy Football Roast Agent
+
+The Sleeper player database is tens of megabytes once parsed into Python dicts. When
+reports are generated in a process pool, the parent publishes a compact copy of it once
+into a memory-mapped file and every worker attaches to that file instead of holding its
+own copy; the OS shares the pages between processes.
+
+File layout (little-endian):
+    header  MAGIC, VERSION, row count, heap offset
+    rows    fixed-width records sorted by player ID: the ID, an (offset, length) pair into
+            the string heap for each string column, and the integer columns
+    heap    UTF-8 strings, each distinct value stored once
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from config import get_config
+
+config = get_config()
+
+MAGIC = b"RPT1"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+ID_WIDTH = 16
+STRING_COLUMNS = ("first_name", "last_name", "position", "team", "height", "weight",
+                  "college", "injury_status", "fantasy_positions")
+INT_COLUMNS = ("age", "years_exp")
+ROW = struct.Struct(f"<{ID_WIDTH}s" + "IH" * len(STRING_COLUMNS) + "h" * len(INT_COLUMNS))
+
+NULL_LENGTH = 0xFFFF  # String column holds None
+NULL_INT = -0x8000    # Integer column holds None
+
+
+def publish_player_table(players: Mapping, path: Optional[str] = None) -> str:
+    """Write the player database as a shared player table file; returns its path.
+
+    The file is replaced atomically, so processes already attached keep reading the
+    old copy until they reattach.
+    """
+    path = Path(path or config["player_table_path"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    heap = bytearray()
+    interned: Dict[str, tuple] = {}
+
+    def intern(value: Any) -> tuple:
+        """(offset, length) of value in the heap, adding it the first time it's seen"""
+        if value is None:
+            return 0, NULL_LENGTH
+        text = ",".join(str(v) for v in value) if isinstance(value, list) else str(value)
+        if text not in interned:
+            # Over-long values are cut at a character boundary so they still decode
+            data = text.encode("utf-8")[:NULL_LENGTH - 1].decode("utf-8", "ignore").encode("utf-8")
+            interned[text] = (len(heap), len(data))
+            heap.extend(data)
+        return interned[text]
+
+    def integer(value: Any) -> int:
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return NULL_INT
+        return value if -0x7FFF <= value <= 0x7FFF else NULL_INT
+
+    rows = bytearray()
+    ids = sorted(pid for pid in players if len(pid.encode("utf-8")) <= ID_WIDTH)
+    for player_id in ids:
+        player = players[player_id]
+        fields = [player_id.encode("utf-8")]
+        for column in STRING_COLUMNS:
+            fields.extend(intern(player.get(column)))
+        fields.extend(integer(player.get(column)) for column in INT_COLUMNS)
+        rows.extend(ROW.pack(*fields))
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".players-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(ids), HEADER.size + len(rows)))
+            f.write(rows)
+            f.write(heap)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return str(path)
+
+
+class PlayerTableReader(Mapping):
+    """Read-only, zero-copy view of a shared player table.
+
+    Behaves like the player database dict (player ID -> player fields), but each lookup
+    binary-searches the mapped rows and decodes just the one record it returns.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config["player_table_path"])
+        with open(self.path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._heap = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} player table")
+        self.names = _NameView(self)
+
+    def _id_at(self, index: int) -> bytes:
+        start = HEADER.size + index * ROW.size
+        return self._buf[start:start + ID_WIDTH].rstrip(b"\0")
+
+    def _find(self, player_id: str) -> int:
+        """Row index of player_id, or -1"""
+        key = player_id.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self._id_at(lo) == key else -1
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self._heap + offset
+        return self._buf[start:start + length].decode("utf-8")
+
+    def _row(self, index: int) -> tuple:
+        return ROW.unpack_from(self._buf, HEADER.size + index * ROW.size)
+
+    def _record(self, row: tuple) -> Dict[str, Any]:
+        record: Dict[str, Any] = {}
+        for i, column in enumerate(STRING_COLUMNS):
+            record[column] = self._string(row[1 + 2 * i], row[2 + 2 * i])
+        for i, column in enumerate(INT_COLUMNS):
+            value = row[1 + 2 * len(STRING_COLUMNS) + i]
+            record[column] = None if value == NULL_INT else value
+        positions = record["fantasy_positions"]
+        record["fantasy_positions"] = positions.split(",") if positions else []
+        return record
+
+    def name(self, player_id: str) -> Optional[str]:
+        """Display name ("First Last", or just the last name) without decoding the whole record"""
+        index = self._find(player_id)
+        if index < 0:
+            return None
+        row = self._row(index)
+        first_name = self._string(row[1], row[2])
+        last_name = self._string(row[3], row[4])
+        if first_name and last_name:
+            return f"{first_name} {last_name}"
+        return last_name or None
+
+    def __getitem__(self, player_id: str) -> Dict[str, Any]:
+        index = self._find(player_id)
+        if index < 0:
+            raise KeyError(player_id)
+        return self._record(self._row(index))
+
+    def __contains__(self, player_id: object) -> bool:
+        return isinstance(player_id, str) and self._find(player_id) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._id_at(index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._buf.close()
+
+
+class _NameView(Mapping):
+    """player ID -> display name, read straight from the shared table"""
+
+    def __init__(self, reader: PlayerTableReader):
+        self._reader = reader
+
+    def __getitem__(self, player_id: str) -> str:
+        name = self._reader.name(player_id)
+        if name is None:
+            raise KeyError(player_id)
+        return name
+
+    def get(self, player_id: str, default: Optional[str] = None) -> Optional[str]:
+        name = self._reader.name(player_id)
+        return default if name is None else name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._reader)
+
+    def __len__(self) -> int:
+        return len(self._reader)
@@ -0,0 +1,237 @@
+"""Profiling Mode for Fantasy Football Roast Agent
+
+When enabled (run_roast.py --profile), each pipeline stage is wrapped in a cProfile
+profiler and a pair of tracemalloc snapshots. For every stage a hotspot report (functions
+sorted by cumulative and own time) and the top allocation sites are written to a
+profile directory, along with the raw .prof file for snakeviz or pstats. Agent turns are
+profiled from the model-call hooks (ProfilingHooks): one stage per model turn, from the
+model call through the tool calls it asked for.
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from strands.hooks import AfterInvocationEvent, BeforeModelCallEvent, HookProvider, HookRegistry
+from config import get_config
+from token_accounting import current_attribution
+
+config = get_config()
+
+# Before 3.12 cProfile only sees the thread it was enabled on; from 3.12 it uses
+# sys.monitoring, which covers every thread but allows one active profiler per process
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+class Profiler:
+    """Per-stage CPU and memory profiler.
+
+    Only one stage holds the CPU profiler at a time (Python 3.12+ allows a single active
+    profiler per process). A stage that starts while another holds it - a nested stage,
+    or a concurrent report's stage - is still timed and its memory growth recorded, and
+    it is listed under the stage whose profile contains its CPU time. Before 3.12, every
+    thread started during a profiled stage (the agent's event loop and tool threads) gets
+    its own profiler and their stats are merged into the stage report.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_dir: Optional[Path] = None
+        self.stages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._owner: Optional[Dict[str, Any]] = None
+        self._thread_profilers: List[cProfile.Profile] = []
+
+    def enable(self, output_dir: Optional[Path] = None) -> Path:
+        """Turn profiling on; reports go to a new timestamped directory under output_dir"""
+        output_dir = Path(output_dir or config["output_dir"])
+        self.output_dir = output_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(config["profile_traceback_frames"])
+        self.enabled = True
+        return self.output_dir
+
+    def _start_thread_profiler(self, frame, event, arg) -> None:
+        """threading.setprofile hook: runs once in each new thread and swaps in a real profiler"""
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._thread_profilers.append(profiler)
+        sys.setprofile(None)
+        profiler.enable()
+
+    def start(self, name: str) -> Optional[Dict[str, Any]]:
+        """Open a stage; pass the result to stop(). None when profiling is off."""
+        if not self.enabled:
+            return None
+        opened: Dict[str, Any] = {"name": name, "start": time.perf_counter()}
+        with self._lock:
+            if self._owner is None:
+                self._owner = opened
+                self._thread_profilers = []
+            else:
+                opened["within"] = self._owner["name"]
+        if "within" in opened:
+            opened["allocated"] = tracemalloc.get_traced_memory()[0]
+            return opened
+
+        tracemalloc.reset_peak()
+        opened["before"] = tracemalloc.take_snapshot()
+        opened["profiler"] = cProfile.Profile()
+        try:
+            opened["profiler"].enable()
+        except ValueError as e:
+            # Another profiler (e.g. an external one) is already active in this process
+            print(f"⚠️  Profiling {name}: CPU profile unavailable ({e})")
+            opened["profiler"] = None
+        if opened["profiler"] and _PER_THREAD_PROFILERS:
+            threading.setprofile(self._start_thread_profiler)
+        opened["start"] = time.perf_counter()
+        return opened
+
+    def stop(self, opened: Optional[Dict[str, Any]]) -> None:
+        """Close a stage from start() and write its report"""
+        if opened is None:
+            return
+        elapsed = time.perf_counter() - opened["start"]
+        if "within" in opened:
+            with self._lock:
+                self.stages.append({"stage": opened["name"], "file": None, "seconds": elapsed, "peak_bytes": None,
+                                    "net_bytes": tracemalloc.get_traced_memory()[0] - opened["allocated"],
+                                    "within": opened["within"]})
+            return
+
+        profiler = opened["profiler"]
+        if profiler:
+            profiler.disable()
+            if _PER_THREAD_PROFILERS:
+                threading.setprofile(None)
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+        with self._lock:
+            thread_profilers, self._thread_profilers = self._thread_profilers, []
+            self._owner = None
+        self._write_stage(opened["name"], elapsed, peak, profiler, thread_profilers, opened["before"], after)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the wrapped block as one named stage"""
+        opened = self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(opened)
+
+    def _write_stage(self, name: str, elapsed: float, peak: int, profiler: Optional[cProfile.Profile],
+                     thread_profilers: List[cProfile.Profile], before: tracemalloc.Snapshot,
+                     after: tracemalloc.Snapshot) -> None:
+        with self._lock:
+            index = len(self.stages) + 1
+            slug = f"{index:02d}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}"
+            self.stages.append({"stage": name, "file": slug, "seconds": elapsed, "peak_bytes": peak})
+
+        stats = None
+        for thread_profiler in [p for p in [profiler] if p] + thread_profilers:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(thread_profiler)
+                else:
+                    stats.add(thread_profiler)
+            except TypeError:
+                pass  # The thread never made a profiled call
+        if stats:
+            stats.dump_stats(str(self.output_dir / f"{slug}.prof"))
+
+        # Leave out the profiler's own bookkeeping
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        allocations = sorted((a for a in diff if a.size_diff > 0), key=lambda a: a.size_diff, reverse=True)
+        net = sum(a.size_diff for a in diff)
+
+        report = io.StringIO()
+        report.write(f"Stage: {name}\n")
+        report.write(f"Wall time: {elapsed:.3f}s | Peak traced memory: {peak / 1e6:.1f} MB | "
+                     f"Net allocated: {net / 1e6:+.1f} MB | Threads profiled: "
+                     f"{'all' if not _PER_THREAD_PROFILERS else 1 + len(thread_profilers)}\n\n")
+        top = config["profile_top_n"]
+        for sort_key in ("cumulative", "tottime"):
+            report.write(f"=== Hotspots by {sort_key} ===\n")
+            if stats:
+                stats.stream = report
+                stats.sort_stats(sort_key).print_stats(top)
+            else:
+                report.write("(no CPU profile)\n\n")
+        report.write("=== Top allocation sites (net growth during stage) ===\n")
+        for stat in allocations[:top]:
+            frame = stat.traceback[0]
+            report.write(f"{stat.size_diff / 1024:>10.1f} KiB {stat.count_diff:>+8} blocks  "
+                         f"{frame.filename}:{frame.lineno}\n")
+
+        (self.output_dir / f"{slug}.txt").write_text(report.getvalue(), encoding="utf-8")
+
+    def write_summary(self) -> Optional[str]:
+        """Write summary.txt listing every stage; returns the profile directory"""
+        if not self.enabled:
+            return None
+        lines = [f"{'Stage':<40} {'Seconds':>9} {'Peak MB':>9}  Report"]
+        for stage in self.stages:
+            if stage.get("within"):
+                # Timed only: its CPU time is in the report of the stage that held the profiler
+                lines.append(f"{stage['stage'][:40]:<40} {stage['seconds']:>9.3f} {'-':>9}  "
+                             f"(in {stage['within']}, net {stage['net_bytes'] / 1e6:+.1f} MB)")
+                continue
+            lines.append(f"{stage['stage'][:40]:<40} {stage['seconds']:>9.3f} "
+                         f"{stage['peak_bytes'] / 1e6:>9.1f}  {stage['file']}.txt")
+        (self.output_dir / "summary.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return str(self.output_dir)
+
+
+profiler = Profiler()
+
+
+def stage(name: str):
+    return profiler.stage(name)
+
+
+class ProfilingHooks(HookProvider):
+    """Agent hooks profiling each model turn as its own stage.
+
+    A turn runs from one model call to the next (or the end of the invocation), so it
+    covers the model call and the tool calls it asked for. Stages are named
+    agent_turn:<section>:<n>, using the section the agent is writing.
+    """
+
+    def __init__(self):
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._turns = 0
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, self.before_model)
+        registry.add_callback(AfterInvocationEvent, self.after_invocation)
+
+    def before_model(self, event: BeforeModelCallEvent) -> None:
+        if not profiler.enabled:
+            return
+        with self._lock:
+            previous = self._open.pop(id(event.agent), None)
+            self._turns += 1
+            turn = self._turns
+        profiler.stop(previous)
+        _, section = current_attribution()
+        opened = profiler.start(f"agent_turn:{section or '-'}:{turn:02d}")
+        with self._lock:
+            self._open[id(event.agent)] = opened
+
+    def after_invocation(self, event: AfterInvocationEvent) -> None:
+        with self._lock:
+            opened = self._open.pop(id(event.agent), None)
+        profiler.stop(opened)
@@ -0,0 +1,103 @@
+"""Report Catalogue for Fantasy Football Roast Agent
+
+Records every generated report with a hash of the data it was built from, so a rerun
+on unchanged league data can hand back the existing report instead of regenerating it.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import get_config
+
+config = get_config()
+
+
+def input_hash(facts: Dict[str, Any], model_id: str) -> str:
+    """Content hash of a report's input data snapshot (plus the model that will write it).
+
+    Facts listed in CATALOG_VOLATILE_FACTS (e.g. hourly trending churn) are left out so
+    they alone never force a regeneration.
+    """
+    snapshot = {k: v for k, v in facts.items() if k not in config["catalog_volatile_facts"]}
+    payload = json.dumps({"model_id": model_id, "facts": snapshot}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCatalog:
+    """SQLite catalogue of generated reports: target, league, week, input hash, model, timing, path"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config["report_catalog_path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                league_id TEXT NOT NULL,
+                season TEXT,
+                week INTEGER,
+                input_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                duration REAL NOT NULL,
+                output_path TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS reports_lookup ON reports (target, league_id, input_hash);
+        """)
+        self._conn.commit()
+
+    def find_unchanged(self, target: str, league_id: str, input_hash: str) -> Optional[str]:
+        """Path of the newest report built from exactly this input, if it still exists on disk"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT output_path FROM reports WHERE target = ? AND league_id = ? AND input_hash = ? "
+                "ORDER BY started_at DESC",
+                (target, league_id, input_hash)
+            ).fetchall()
+        for (output_path,) in rows:
+            if Path(output_path).exists():
+                return output_path
+        return None
+
+    def record(self, target: str, league_id: str, season: Optional[str], week: Optional[int],
+               input_hash: str, model_id: str, started_at: float, output_path: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO reports (target, league_id, season, week, input_hash, model_id, "
+                "started_at, duration, output_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (target, league_id, season, week, input_hash, model_id,
+                 started_at, time.time() - started_at, output_path)
+            )
+            self._conn.commit()
+
+    def history(self, target: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent catalogue entries, optionally for one target"""
+        query = "SELECT target, league_id, season, week, input_hash, model_id, started_at, duration, output_path FROM reports"
+        params: tuple = ()
+        if target:
+            query += " WHERE target = ?"
+            params = (target,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY started_at DESC LIMIT ?", params + (limit,)).fetchall()
+        columns = ["target", "league_id", "season", "week", "input_hash", "model_id", "started_at", "duration", "output_path"]
+        return [dict(zip(columns, row)) for row in rows]
+
+
+_report_catalog: Optional[ReportCatalog] = None
+_report_catalog_lock = threading.Lock()
+
+
+def get_report_catalog() -> ReportCatalog:
+    """Get the shared report catalogue, creating it on first use"""
+    global _report_catalog
+
+    with _report_catalog_lock:
+        if _report_catalog is None:
+            _report_catalog = ReportCatalog()
+    return _report_catalog
@@ -0,0 +1,141 @@
+"""Report Rendering for Fantasy Football Roast Agent
+
+One process-wide Jinja environment loads the HTML templates from disk, keeps compiled
+templates in memory and persists their bytecode, so each report only pays for rendering.
+Output files are written atomically, optionally with a shared stylesheet and
+pre-compressed siblings for static serving.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from config import get_config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+config = get_config()
+
+TEMPLATE_DIR = Path(__file__).resolve().parent
+REPORT_TEMPLATE = "report_template.html"
+INDEX_TEMPLATE = "index_template.html"
+STYLESHEET = "report.css"
+
+_env: Optional[Environment] = None
+_env_lock = threading.Lock()
+
+
+def get_environment() -> Environment:
+    """Get the shared Jinja environment, creating it (and compiling templates) on first use"""
+    global _env
+
+    with _env_lock:
+        if _env is None:
+            cache_dir = Path(config["template_cache_dir"])
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            _env = Environment(
+                loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+                autoescape=select_autoescape(["html"]),
+                # Templates don't change while the process runs - skip the per-render mtime check
+                auto_reload=False
+            )
+            # Precompile up front so the first report doesn't pay for it
+            for name in (REPORT_TEMPLATE, INDEX_TEMPLATE):
+                _env.get_template(name)
+    return _env
+
+
+def get_template(name: str) -> Template:
+    return get_environment().get_template(name)
+
+
+def render_report(team_name: str, league_name: str, season: str, sections: List[Dict[str, Any]],
+                  stylesheet_href: Optional[str] = None) -> str:
+    """Render a full report; each section is a dict with already-converted HTML `content`.
+
+    With stylesheet_href the report links to a shared stylesheet instead of inlining the CSS.
+    """
+    return get_template(REPORT_TEMPLATE).render(
+        team_name=team_name,
+        league_name=league_name,
+        season=season,
+        timestamp=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        sections=sections,
+        stylesheet_href=stylesheet_href
+    )
+
+
+def render_index(league_name: str, season: str, reports: List[Dict[str, Any]]) -> str:
+    """Render the batch index page linking every generated report"""
+    return get_template(INDEX_TEMPLATE).render(
+        league_name=league_name,
+        season=season,
+        timestamp=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        reports=reports
+    )
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write through a uniquely named temp file in the same directory, then rename into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600 files; reports are meant to be served
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_output(path: Path, text: str) -> str:
+    """Atomically write a report file plus any configured pre-compressed siblings (.gz / .br)"""
+    path = Path(path)
+    if "br" in config["report_compression"] and brotli is None:
+        print("⚠️ brotli is not installed - skipping .br output (pip install brotli)")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    _write_atomic(path, data)
+
+    for encoding in config["report_compression"]:
+        if encoding == "gz":
+            # mtime=0 keeps the output byte-identical for identical input
+            _write_atomic(path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+        elif encoding == "br":
+            if brotli is None:
+                continue
+            _write_atomic(path.with_name(path.name + ".br"), brotli.compress(data))
+    return str(path)
+
+
+_stylesheets: Dict[str, str] = {}
+_stylesheets_lock = threading.Lock()
+
+
+def publish_stylesheet(output_dir: Path) -> str:
+    """Write the report CSS once per output directory under a content-hashed name.
+
+    Returns the href reports in that directory should link to. The hash changes whenever
+    report.css does, so the file can be served with far-future cache headers.
+    """
+    output_dir = Path(output_dir)
+    with _stylesheets_lock:
+        key = str(output_dir.resolve())
+        if key not in _stylesheets:
+            css = (TEMPLATE_DIR / STYLESHEET).read_text(encoding="utf-8")
+            digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+            filename = f"report.{digest}.css"
+            if not (output_dir / filename).exists():
+                write_output(output_dir / filename, css)
+            _stylesheets[key] = filename
+        return _stylesheets[key]
@@ -0,0 +1,172 @@
+"""Resilience Helpers for Outbound I/O: retries, hedged requests and circuit breakers"""
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Tuple, Type
+from config import get_config
+
+config = get_config()
+
+# Hedged requests run on their own small pool so they never starve the caller's pool
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+# At most half the pool may be running second (hedge) requests; a losing hedge can't be
+# interrupted once it's on the wire, so this keeps stragglers from crowding out first calls
+_hedge_slots = threading.BoundedSemaphore(4)
+
+
+class RetryableError(Exception):
+    """A failure worth retrying (throttling, server errors, transient network issues)"""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open"""
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base * 2^attempt)]"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_call(fn: Callable[[], Any], attempts: int = None, base_delay: float = None,
+               max_delay: float = None, retry_on: Tuple[Type[BaseException], ...] = (RetryableError,)) -> Any:
+    """Call fn, retrying on the given exceptions with jittered exponential backoff"""
+    attempts = attempts or config["retry_attempts"]
+    base_delay = config["retry_base_delay"] if base_delay is None else base_delay
+    max_delay = config["retry_max_delay"] if max_delay is None else max_delay
+
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except retry_on:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+
+def hedged_call(fn: Callable[[], Any], hedge_after: float) -> Any:
+    """Call fn; if it hasn't finished after hedge_after seconds, race a second identical call.
+
+    Returns the first successful result. Only use for idempotent requests. No hedge is
+    sent while every hedge slot is taken; the call then just waits for the first request.
+    Both requests run in a copy of the caller's context, so they keep its league and
+    trace span.
+    """
+    first = _hedge_executor.submit(contextvars.copy_context().run, fn)
+    done, _ = wait([first], timeout=hedge_after)
+    if done or not _hedge_slots.acquire(blocking=False):
+        return first.result()
+
+    hedge = _hedge_executor.submit(contextvars.copy_context().run, fn)
+    hedge.add_done_callback(lambda _: _hedge_slots.release())
+    pending = {first, hedge}
+    error = None
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+    finally:
+        # The loser is dropped if it hasn't started; a running one finishes in the background
+        for future in pending:
+            future.cancel()
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while so callers fail fast to cached data.
+
+    Closed: calls flow. After failure_threshold consecutive failures it opens and
+    rejects calls for reset_timeout seconds, then lets one trial call through
+    (half-open); success closes it again, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or config["circuit_failure_threshold"]
+        self.reset_timeout = reset_timeout or config["circuit_reset_timeout"]
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through right now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def _end_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[[], Any], trip_on: Tuple[Type[BaseException], ...] = (Exception,)) -> Any:
+        """Run fn through the breaker, raising CircuitOpenError if it is open.
+
+        Only exceptions in trip_on count as failures; anything else means the dependency
+        answered (e.g. a 404) and leaves the breaker closed.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        outcome = None
+        try:
+            result = fn()
+            outcome = "success"
+            return result
+        except trip_on:
+            outcome = "failure"
+            raise
+        except Exception:
+            outcome = "success"
+            raise
+        finally:
+            if outcome == "failure":
+                self.record_failure()
+            elif outcome == "success":
+                self.record_success()
+            else:
+                # KeyboardInterrupt, SystemExit, ... - no verdict, but free the half-open trial
+                self._end_trial()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for a named dependency"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
@@ -2,62 +2,208 @@
 
 import os
 import json
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from jinja2 import Template
 
 from strands import Agent, tool
 from config import get_config
+from checkpoint import RunCheckpoint
+from report_catalog import get_report_catalog, input_hash
+from llm_cache import build_model
+from report_renderer import publish_stylesheet, render_report, write_output
+from markdown_html import markdown_to_html
+from metrics import MetricsHooks, call_tool
+from tracing import TracingHooks, span
+from token_accounting import UsageHooks, attribute_to
+from profiling import ProfilingHooks, stage
+from league_context import LeagueContext, current_league, use_league
 from sleeper_tools import (
     get_nfl_state, get_league_info, get_team_data, get_matchup_data,
     get_trending_players, get_draft_analysis, calculate_league_averages,
     get_all_rosters_with_users, get_player_details
 )
 from web_tools import (
-    search_player_news, search_fantasy_trends, search_team_analysis,
-    search_trade_analysis, search_injury_reports
+    search_player_news, search_roster_news, search_stored_news, search_fantasy_trends,
+    search_team_analysis, search_trade_analysis, search_injury_reports
 )
 
 config = get_config()
 
+# Report sections, generated (and checkpointed) one at a time. Each section only
+# exposes the tool subsets it needs, keeping per-turn tool schema overhead down.
+REPORT_SECTIONS = [
+    {"key": "team_snapshot", "title": "1. Team Snapshot",
+     "focus": "Investigate record, ranking, points vs league average",
+     "tools": ["sleeper", "investigation"]},
+    {"key": "draft_autopsy", "title": "2. Draft Autopsy",
+     "focus": "Research how draft picks are performing now",
+     "tools": ["sleeper", "draft", "web"]},
+    {"key": "last_week_matchup", "title": "3. Last Week's Matchup",
+     "focus": "Find actual opponent and analyze specific performance and lineup decisions",
+     "tools": ["sleeper", "investigation", "web"]},
+    {"key": "upcoming_battle", "title": "4. Upcoming Battle Preview",
+     "focus": "Research next opponent and predict outcome",
+     "tools": ["sleeper", "investigation", "web"]},
+    {"key": "roster_intervention", "title": "5. Roster Intervention",
+     "focus": "Compare roster to trending players and suggest moves",
+     "tools": ["sleeper", "web"]},
+    {"key": "playoff_reality_check", "title": "6. Playoff Reality Check",
+     "focus": "Calculate actual playoff chances and roast accordingly",
+     "tools": ["sleeper", "investigation"]},
+    {"key": "final_verdict", "title": "7. Final Verdict",
+     "focus": "Synthesize all findings into brutal final assessment",
+     "tools": []},
+]
+
 class FantasyFootballRoastAgent:
     """The most savage fantasy football analyst on the planet"""
     
-    def __init__(self):
-        self.agent = Agent(
-            name="FantasyRoastMaster",
-            model=config["model_id"],
-            system_prompt=self._get_system_prompt(),
-            tools=[
-                # Sleeper API Tools - for raw data gathering
+    def __init__(self, model=None, league: Optional[LeagueContext] = None):
+        # The league this agent reports on; tools pick it up through the league context
+        self.league = league or current_league()
+        # Model calls go through the response cache (or the offline replay model) by default
+        self.model = model or build_model()
+        self.system_prompt = self._get_system_prompt()
+        self.toolsets = {
+            # Sleeper API Tools - for raw data gathering
+            "sleeper": [
                 get_nfl_state,
                 get_league_info, 
                 get_team_data,
                 get_matchup_data,
                 get_trending_players,
-                get_draft_analysis,
                 calculate_league_averages,
                 get_all_rosters_with_users,
-                get_player_details,
-                # Web Search Tools - for current context and investigation
+                get_player_details
+            ],
+            # Draft Tools - only useful when the draft is under discussion
+            "draft": [
+                get_draft_analysis,
+                self._analyze_draft_vs_current_performance
+            ],
+            # Web Search Tools - for current context and investigation
+            "web": [
+                search_stored_news,
                 search_player_news,
+                search_roster_news,
                 search_fantasy_trends,
                 search_team_analysis,
                 search_trade_analysis,
-                search_injury_reports,
-                # Investigation and Analysis Tools
+                search_injury_reports
+            ],
+            # Investigation and Analysis Tools
+            "investigation": [
                 self._investigate_last_week_matchup,
-                self._analyze_draft_vs_current_performance,
                 self._find_league_context,
                 self._research_upcoming_opponent,
                 self._generate_section_content
             ]
-        )
+        }
+        
+        # One agent per tool subset, built once and cached; they all share the model client
+        # and a single conversation history, so only the tool schemas sent per turn differ
+        self._agents = {}
+        self.metrics_hooks = MetricsHooks()
+        self.tracing_hooks = TracingHooks()
+        self.usage_hooks = UsageHooks()
+        self.profiling_hooks = ProfilingHooks()
+        self.agent = self._agent_for(tuple(self.toolsets))
+        
+        # Compact league-wide context carried from one target's conversation to the next,
+        # valid only for the league and NFL week it was built from
+        self.league_summary = None
+        self.league_summary_key = None
+        self.current_target = None
         
         # Ensure output directory exists
         Path(config["output_dir"]).mkdir(exist_ok=True)
     
+    def _agent_for(self, toolset_names) -> Agent:
+        """Get the cached agent exposing only the given tool subsets"""
+        key = tuple(sorted(toolset_names))
+        if key not in self._agents:
+            tools = [t for name in key for t in self.toolsets[name]]
+            self._agents[key] = Agent(
+                name="FantasyRoastMaster",
+                model=self.model,
+                system_prompt=self.system_prompt,
+                tools=tools,
+                hooks=[self.metrics_hooks, self.tracing_hooks, self.usage_hooks, self.profiling_hooks]
+            )
+        return self._agents[key]
+    
+    def _run_agent(self, prompt: str, toolset_names):
+        """Invoke the agent for one turn with a restricted tool subset on the shared conversation"""
+        agent = self._agent_for(toolset_names)
+        agent.messages = self.agent.messages
+        try:
+            return agent(prompt)
+        finally:
+            self.agent.messages = agent.messages
+    
+    def start_conversation(self, display_name: str) -> None:
+        """Begin a fresh conversation for a new target.
+        
+        The model client and tool registry are reused; only the message history is reset,
+        so later targets never pay for earlier targets' tokens. If league context carrying
+        is enabled, the league summary from earlier targets seeds the new conversation - but
+        only while it is still for this league and NFL week; a stale summary is dropped.
+        """
+        # Clear in place so anything holding a reference to the history sees the reset
+        self.agent.messages.clear()
+        self.current_target = display_name
+        
+        if self.league_summary and self.league_summary_key != self._league_summary_key(get_nfl_state()):
+            self.league_summary = self.league_summary_key = None
+        if config["carry_league_context"] and self.league_summary:
+            self.agent.messages.extend([
+                {"role": "user", "content": [{"text": f"Shared league context (already verified):\n{self.league_summary}"}]},
+                {"role": "assistant", "content": [{"text": "Noted - I'll use this as the league baseline."}]}
+            ])
+    
+    def _league_summary_key(self, nfl_state: Dict[str, Any]) -> Optional[tuple]:
+        """(league, season, week) a league summary was built for; None if the week is unknown"""
+        if not nfl_state.get("success"):
+            return None
+        return self.league.league_id, nfl_state["data"].get("season"), nfl_state["data"].get("current_week")
+    
+    def _refresh_league_summary(self, facts: Dict[str, Any]) -> None:
+        """Rebuild the carried league summary from this report's facts.
+        
+        The summary is cheap to build, so it is rebuilt from every report's freshly gathered
+        facts: a new week, a trade or new trending players reach the next target's conversation.
+        """
+        key = self._league_summary_key(facts["nfl_state"])
+        summary = self._summarize_league_context(facts) if key else None
+        self.league_summary, self.league_summary_key = (summary, key) if summary else (None, None)
+    
+    def _summarize_league_context(self, facts: Dict[str, Any]) -> Optional[str]:
+        """Condense the league-wide facts into a short summary worth carrying between targets"""
+        league_context = facts.get("league_context", {})
+        if not league_context.get("success"):
+            return None
+        
+        data = league_context["data"]
+        averages = data.get("averages", {})
+        lines = [
+            f"League: {data.get('league_name')} ({data.get('total_teams')} teams, status: {data.get('league_status')})",
+            f"Averages: {averages.get('avg_points_for')} PF, {averages.get('avg_points_against')} PA, "
+            f"{averages.get('avg_wins')} wins, {averages.get('avg_moves')} moves per team",
+            "Managers: " + ", ".join(u.get("display_name", "Unknown") for u in data.get("all_users", []))
+        ]
+        
+        trending = facts.get("trending_players", {})
+        if trending.get("success"):
+            adds = ", ".join(p["name"] for p in trending["data"]["trending_adds"])
+            drops = ", ".join(p["name"] for p in trending["data"]["trending_drops"])
+            lines.append(f"Trending adds: {adds}")
+            lines.append(f"Trending drops: {drops}")
+        
+        return "\n".join(lines)
+    
     def _get_system_prompt(self) -> str:
         """Get the roast agent's system prompt"""
         return f"""You are the MOST SAVAGE fantasy football roast agent ever created. Your job is to investigate, analyze, and roast fantasy football teams with BRUTAL HONESTY and hilarious snark.
@@ -83,7 +229,7 @@ You are an investigative fantasy football analyst. Use ALL available tools to ga
 **CRITICAL INVESTIGATION INSTRUCTIONS:**
 - **Multi-Tool Analysis:** Use 3-5+ tools per section to build comprehensive picture
 - **Follow Your Instincts:** If something seems suspicious, investigate further
-- **Web Search Strategy:** Search for player news when you see unexpected performances
+- **Web Search Strategy:** Search for player news when you see unexpected performances; use search_roster_news to research several players in one call, and check search_stored_news first since it answers from already-collected news instantly
 - **Cross-Reference Everything:** Draft picks vs. current performance, bench vs. starters, opponent strengths vs. user weaknesses
 - **Question Everything:** Why did they lose? Why did they draft that player? Why didn't they pick up trending players?
 - **League Context:** Always compare to what other teams are doing
@@ -138,8 +284,8 @@ Generate exactly 7 sections. For each, consider these investigative angles (purs
 
 **TODAY'S CONTEXT:**
 - Date: {datetime.now().strftime('%B %d, %Y')}
-- Season: {config['season']}
-- League: {config['league_id']}
+- Season: {self.league.season}
+- League: {self.league.league_id}
 
 Remember: Be a detective first, roaster second. Gather the evidence, then deliver the verdict with maximum entertainment value!"""
 
@@ -347,212 +493,209 @@ Remember: Be a detective first, roaster second. Gather the evidence, then delive
         try:
             # This tool allows the agent to structure its findings into section content
             # The agent will call this after gathering data to format its roast
+            # (no timestamp here - tool results feed the LLM cache key and must be deterministic)
             return {
                 "success": True,
                 "data": {
                     "section": section_name,
-                    "content": investigation_data,
-                    "timestamp": datetime.now().isoformat()
+                    "content": investigation_data
                 }
             }
         except Exception as e:
             return {"success": False, "error": f"Content generation failed: {str(e)}"}
 
-    def generate_report(self, display_name: str) -> str:
-        """Generate complete roast report with AI agent doing all analysis"""
+    def generate_report(self, display_name: str, run_dir: Optional[str] = None, resume: bool = True,
+                        force: bool = False) -> str:
+        """Generate complete roast report with AI agent doing all analysis.
+
+        Data-gathering steps and each generated section are checkpointed into a run
+        directory, so a failed or interrupted run resumes and only regenerates what is missing.
+        If the report catalogue already has a report built from identical input data, that
+        report is returned instead (unless force is set).
+        """
+        track = f"{self.league.league_id}:{display_name}"  # One trace row group per report
+        with use_league(self.league), \
+                span("generate_report", "run", track=track, target=display_name, league=self.league.league_id), \
+                attribute_to(target=display_name):
+            return self._generate_report(display_name, run_dir, resume, force)
+    
+    def _generate_report(self, display_name: str, run_dir: Optional[str], resume: bool, force: bool) -> str:
+        checkpoint = None
         try:
             print(f"🔥 Starting investigative roast for {display_name}...")
-            
-            # Let the agent generate the complete report
-            prompt = f"""
-            Generate a complete fantasy football roast report for {display_name}.
-            
-            You MUST:
-            1. Use tools to investigate their team thoroughly 
-            2. Research current player news and trends
-            3. Find their actual opponents and analyze specific matchups
-            4. Compare to league averages and other teams
-            5. Generate 7 sections of savage but truthful analysis
-            
-            INVESTIGATION REQUIREMENTS:
-            - Get current NFL state and league info
-            - Analyze their team data and league ranking
-            - Investigate last week's matchup with actual opponent
-            - Research draft performance vs current roster
-            - Look up trending players and waiver wire context
-            - Find league-wide context for comparisons
-            
-            Generate exactly these 7 sections with detailed roast content:
-            
-            ## 1. Team Snapshot
-            [Investigate record, ranking, points vs league average]
-            
-            ## 2. Draft Autopsy  
-            [Research how draft picks are performing now]
-            
-                         ## 3. Last Week's Matchup
-             [Find actual opponent and analyze specific performance and lineup decisions]
-            
-            ## 4. Upcoming Battle Preview
-            [Research next opponent and predict outcome]
-            
-            ## 5. Roster Intervention
-            [Compare roster to trending players and suggest moves]
-            
-            ## 6. Playoff Reality Check
-            [Calculate actual playoff chances and roast accordingly]
-            
-            ## 7. Final Verdict
-            [Synthesize all findings into brutal final assessment]
-            
-            Be investigative, specific, and savage. Use player names, cite exact numbers, and find real examples of bad decisions!
-            """
-            
-            # Let the agent investigate and generate the report
-            response = self.agent(prompt)
-            
-            # Extract content from AgentResult object
-            if hasattr(response, 'content'):
-                agent_content = response.content
-            elif hasattr(response, 'text'):
-                agent_content = response.text
-            else:
-                agent_content = str(response)
+            started_at = time.time()
+            checkpoint = RunCheckpoint.open(display_name, run_dir=run_dir, resume=resume,
+                                             league_id=self.league.league_id)
+            self.start_conversation(display_name)
+            
+            # Gather the raw facts up front so every section starts from the same evidence
+            with span("gather_facts", "phase"), stage("league_data"):
+                facts = self._gather_facts(display_name, checkpoint)
+            self._refresh_league_summary(facts)
+            facts_hash = input_hash(facts, config["model_id"])
+            catalog = get_report_catalog()
+            if config["skip_unchanged_reports"] and not force:
+                existing = catalog.find_unchanged(display_name, self.league.league_id, facts_hash)
+                if existing:
+                    print(f"♻️  League data unchanged since the last report - reusing {existing}")
+                    checkpoint.mark_complete(existing)
+                    return existing
+            
+            sections = []
+            briefed = False
+            for section in REPORT_SECTIONS:
+                content = checkpoint.load_section(section["key"])
+                if content is None:
+                    print(f"✍️  Writing section: {section['title']}")
+                    with self._section_scope(section["key"]):
+                        content = self._generate_section(display_name, section, None if briefed else facts)
+                    briefed = True
+                    checkpoint.save_section(section["key"], content)
+                else:
+                    print(f"✅ Section already checkpointed: {section['title']}")
+                sections.append(content)
             
             # The agent should have generated markdown content
             # Now wrap it in HTML template
-            return self._render_html_report(display_name, agent_content)
+            with span("render_html", "phase"):
+                report_path = self._render_html_report(display_name, sections)
+            checkpoint.mark_complete(report_path)
+            
+            nfl_state = facts["nfl_state"].get("data", {}) if facts["nfl_state"]["success"] else {}
+            catalog.record(
+                target=display_name,
+                league_id=self.league.league_id,
+                season=nfl_state.get("season"),
+                week=nfl_state.get("current_week"),
+                input_hash=facts_hash,
+                model_id=config["model_id"],
+                started_at=started_at,
+                output_path=report_path
+            )
+            return report_path
             
         except Exception as e:
             print(f"❌ Error generating report: {e}")
+            if checkpoint is not None:
+                print(f"💾 Progress checkpointed in {checkpoint.run_dir} - rerun to resume")
             return self._create_error_report(f"Report generation failed: {str(e)}")
     
-    def _render_html_report(self, team_name: str, agent_content: str) -> str:
-        """Render the agent's markdown content into HTML report"""
+    @contextmanager
+    def _section_scope(self, key: str):
+        """Trace and attribute tokens to everything done while writing one section (its model
+        turns are profiled individually by ProfilingHooks)"""
+        with span(f"section:{key}", "phase"), attribute_to(section=key):
+            yield
+    
+    def _gather_facts(self, display_name: str, checkpoint: RunCheckpoint) -> Dict[str, Any]:
+        """Run the core data-gathering steps, each checkpointed individually"""
+        # Called directly rather than by the agent, so the tool hooks never see these calls
+        facts = {
+            "nfl_state": checkpoint.step("nfl_state", lambda: call_tool(get_nfl_state)),
+            "team_data": checkpoint.step("team_data", lambda: call_tool(get_team_data, display_name)),
+            "league_context": checkpoint.step(
+                "league_context", lambda: call_tool(self._find_league_context, display_name)
+            ),
+            "draft_analysis": checkpoint.step(
+                "draft_analysis", lambda: call_tool(self._analyze_draft_vs_current_performance, display_name)
+            ),
+            "trending_players": checkpoint.step("trending_players", lambda: call_tool(get_trending_players)),
+        }
+        
+        current_week = facts["nfl_state"].get("data", {}).get("current_week") if facts["nfl_state"]["success"] else None
+        if current_week:
+            facts["upcoming_opponent"] = checkpoint.step(
+                "upcoming_opponent", lambda: call_tool(self._research_upcoming_opponent, display_name, current_week)
+            )
+            if current_week > 1:
+                facts["last_week_matchup"] = checkpoint.step(
+                    "last_week_matchup",
+                    lambda: call_tool(self._investigate_last_week_matchup, display_name, current_week - 1)
+                )
+        
+        return facts
+    
+    def _generate_section(self, display_name: str, section: Dict[str, Any],
+                          facts: Optional[Dict[str, Any]] = None) -> str:
+        """Have the agent write one report section, retrying on failure"""
+        prompt = f"""
+            Write ONLY the "## {section['title']}" section of the fantasy football roast report for {display_name}.
+            
+            Focus: {section['focus']}
+            
+            Use tools to dig deeper wherever the evidence is thin. Start your answer with the
+            "## {section['title']}" heading and do not write any other section.
+            
+            Be investigative, specific, and savage. Use player names, cite exact numbers, and find real examples of bad decisions!
+            """
+        if facts is not None:
+            prompt += f"""
+            Facts already gathered for this report (JSON) - reuse them instead of re-fetching:
+            {json.dumps(facts, default=str)}
+            """
+        
+        attempts = config["section_max_attempts"]
+        for attempt in range(1, attempts + 1):
+            try:
+                response = self._run_agent(prompt, section["tools"])
+                
+                # Extract content from AgentResult object
+                if hasattr(response, 'content'):
+                    return response.content
+                elif hasattr(response, 'text'):
+                    return response.text
+                return str(response)
+            except Exception as e:
+                if attempt == attempts:
+                    raise
+                print(f"⚠️  Section '{section['title']}' failed (attempt {attempt}/{attempts}): {e}")
+                time.sleep(2 ** attempt)
+    
+    def _render_html_report(self, team_name: str, section_contents: List[str]) -> str:
+        """Render the agent's markdown sections into HTML report"""
         try:
             # Get league info for header
             league_info = get_league_info()
             league_name = league_info["data"]["league_name"] if league_info["success"] else "Fantasy League"
-            season = league_info["data"]["season"] if league_info["success"] else config["season"]
-            
-            # Create simplified template that wraps agent content
-            template_content = """
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>🔥 Fantasy Football Roast Report - {{ team_name }}</title>
-                                 <style>
-                     body { font-family: Georgia, serif; background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; line-height: 1.7; margin: 0; padding: 20px; min-height: 100vh; word-wrap: break-word; }
-                     .container { max-width: 1200px; margin: 0 auto; padding: 0 15px; }
-                     .header { text-align: center; padding: 40px 20px; background: rgba(0,0,0,0.3); border-radius: 15px; margin-bottom: 30px; border: 2px solid #ff6b35; }
-                     .header h1 { font-size: 3rem; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.7); color: #ff6b35; line-height: 1.2; }
-                     .header .subtitle { font-size: 1.2rem; opacity: 0.9; font-style: italic; margin-top: 10px; }
-                     .timestamp { text-align: center; font-size: 0.9rem; opacity: 0.7; margin-bottom: 30px; }
-                     .content { background: rgba(255,255,255,0.1); backdrop-filter: blur(10px); border-radius: 15px; padding: 40px; margin-bottom: 25px; border-left: 5px solid #ff6b35; box-shadow: 0 8px 32px rgba(0,0,0,0.3); min-height: 200px; }
-                     .content h1 { color: #ff6b35; font-size: 2.5rem; margin: 30px 0 25px 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.5); line-height: 1.3; }
-                     .content h2 { color: #ff6b35; font-size: 2rem; margin: 25px 0 20px 0; text-shadow: 1px 1px 2px rgba(0,0,0,0.5); line-height: 1.3; border-bottom: 2px solid #ff6b35; padding-bottom: 10px; }
-                     .content h3 { color: #ffd700; font-size: 1.4rem; margin: 20px 0 15px 0; line-height: 1.4; }
-                     .content p { margin: 18px 0; font-size: 1.1rem; line-height: 1.8; text-align: justify; }
-                     .content ul, .content ol { margin: 20px 0; padding-left: 35px; }
-                     .content li { margin: 8px 0; font-size: 1.05rem; line-height: 1.6; }
-                     .content blockquote { border-left: 4px solid #ffd700; padding-left: 20px; margin: 20px 0; font-style: italic; background: rgba(255,215,0,0.1); padding: 15px 20px; border-radius: 5px; }
-                     .content strong { color: #ffd700; }
-                     .content em { color: #ff6b35; }
-                     .footer { text-align: center; padding: 30px; font-size: 0.9rem; opacity: 0.7; border-top: 1px solid rgba(255,255,255,0.2); margin-top: 40px; }
-                     @media (max-width: 768px) { 
-                         .header h1 { font-size: 2.2rem; } 
-                         .container { padding: 10px; } 
-                         .content { padding: 25px; }
-                         .content h1 { font-size: 2rem; }
-                         .content h2 { font-size: 1.6rem; }
-                         .content p { font-size: 1rem; }
-                     }
-                     @media (max-width: 480px) { 
-                         .header h1 { font-size: 1.8rem; } 
-                         .content { padding: 20px; }
-                         .content h1 { font-size: 1.7rem; }
-                         .content h2 { font-size: 1.4rem; }
-                     }
-                 </style>
-            </head>
-            <body>
-                <div class="container">
-                    <header class="header">
-                        <h1>🔥 Fantasy Football Roast Report 🔥</h1>
-                        <div class="subtitle">{{ league_name }} | {{ season }} Season</div>
-                    </header>
-                    
-                    <div class="timestamp">Report Generated: {{ timestamp }}</div>
-                    
-                    <div class="content">
-                        {{ agent_content | safe }}
-                    </div>
-                    
-                    <footer class="footer">
-                        <p>🔥 This roast was generated by an AI agent with maximum investigative powers 🔥</p>
-                        <p>Powered by Sleeper API, Web Search & Pure Savage Intelligence™</p>
-                        <p><small>All roasts are based on actual data and current events</small></p>
-                    </footer>
-                </div>
-            </body>
-            </html>
-            """
-            
-            template = Template(template_content)
-            
-            # Convert agent's markdown-style content to HTML
-            html_content = self._convert_markdown_to_html(agent_content)
-            
-            final_html = template.render(
-                team_name=team_name,
-                league_name=league_name,
-                season=season,
-                timestamp=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
-                agent_content=html_content
-            )
+            season = league_info["data"]["season"] if league_info["success"] else self.league.season
+            
+            # Convert agent's markdown-style content to HTML, one block per report section
+            with stage("markdown_conversion"):
+                sections = [
+                    {
+                        "key": section["key"],
+                        "title": section["title"],
+                        "content": self._convert_markdown_to_html(content)
+                    }
+                    for section, content in zip(REPORT_SECTIONS, section_contents)
+                ]
+            
+            output_dir = Path(config["output_dir"])
+            stylesheet_href = publish_stylesheet(output_dir) if config["shared_report_assets"] else None
+            with stage("html_rendering"):
+                final_html = render_report(team_name, league_name, season, sections, stylesheet_href)
             
             # Save report
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = config["report_filename_format"].format(
                 display_name=team_name.replace(" ", "_"),
+                league_id=self.league.league_id,
                 timestamp=timestamp
             )
             
-            output_path = Path(config["output_dir"]) / filename
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(final_html)
+            output_path = output_dir / filename
+            write_output(output_path, final_html)
             
             print(f"✅ Report saved to: {output_path}")
             return str(output_path)
             
         except Exception as e:
             print(f"❌ Error rendering report: {e}")
-            return self._create_error_report(f"Failed to render HTML: {str(e)}")
+            raise
     
     def _convert_markdown_to_html(self, content: str) -> str:
         """Convert markdown-style content to HTML"""
-        # Simple markdown to HTML conversion
-        lines = content.split('\n')
-        html_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('## '):
-                html_lines.append(f'<h2>{line[3:]}</h2>')
-            elif line.startswith('### '):
-                html_lines.append(f'<h3>{line[4:]}</h3>')
-            elif line.startswith('# '):
-                html_lines.append(f'<h1>{line[2:]}</h1>')
-            elif line.startswith('- '):
-                html_lines.append(f'<li>{line[2:]}</li>')
-            elif line:
-                html_lines.append(f'<p>{line}</p>')
-            else:
-                html_lines.append('<br>')
-        
-        return '\n'.join(html_lines)
+        return markdown_to_html(content)
     
     def _create_error_report(self, error_message: str) -> str:
         """Create a basic error report"""
@@ -569,9 +712,7 @@ Remember: Be a detective first, roaster second. Gather the evidence, then delive
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"error_report_{timestamp}.html"
         output_path = Path(config["output_dir"]) / filename
-        
-        with open(output_path, "w") as f:
-            f.write(error_html)
+        write_output(output_path, error_html)
         
         return str(output_path)
 
@@ -580,7 +721,7 @@ def main():
     """Main function to run the roast agent"""
     agent = FantasyFootballRoastAgent()
     
-    display_name = config["target_display_name"]
+    display_name = agent.league.target_display_name
     print(f"🎯 Target: {display_name}")
     
     report_path = agent.generate_report(display_name)
@@ -8,8 +8,42 @@ import sys
 import os
 from pathlib import Path
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from roast_agent import FantasyFootballRoastAgent
+from llm_cache import build_model
 from config import get_config
+import metrics
+from tracing import tracer
+from token_accounting import ledger
+from profiling import profiler, stage
+from sleeper_tools import get_player_database, start_warmup
+from league_context import LeagueContext, set_current_league
+
+def write_metrics(config):
+    """Export the run's metrics as JSON (and Prometheus text if configured)"""
+    snapshot = metrics.registry.snapshot()
+    if not snapshot["counters"] and not snapshot["histograms"]:
+        return
+    
+    if config["metrics_json"]:
+        filename = f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        print(f"📈 Metrics saved to: {metrics.registry.write_json(Path(config['output_dir']) / filename)}")
+    if config["metrics_prometheus_file"]:
+        path = Path(config["metrics_prometheus_file"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(metrics.registry.prometheus_text(), encoding="utf-8")
+
+def print_token_usage(config):
+    """Print the per-section token and cost table for the run"""
+    if not ledger.turns:
+        return
+    print()
+    print("🧾 Token usage:")
+    print(ledger.format_summary())
+    if config["metrics_json"]:
+        filename = f"usage_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        print(f"🧾 Usage saved to: {ledger.write_json(Path(config['output_dir']) / filename)}")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -20,6 +54,16 @@ Examples:
   python run_roast.py                    # Use config file target
   python run_roast.py --target "username" # Roast specific user
   python run_roast.py --list-users       # Show available users
+  python run_roast.py --fresh            # Ignore checkpoints from an unfinished run
+  python run_roast.py --force            # Regenerate even if league data is unchanged
+  python run_roast.py --offline          # Replay recorded model responses, no Bedrock
+  python run_roast.py --all-users --workers 4  # Roast the whole league in one run
+  python run_roast.py --all-users --league-id 123 456  # Roast several leagues at once
+  python run_roast.py --all-users --processes  # Worker processes sharing one player table
+  python run_roast.py --serve --port 8765  # Local HTTP report service
+  python run_roast.py --schedule         # Weekly prefetch + reports after MNF
+  python run_roast.py --trace            # Write a Chrome trace of the run
+  python run_roast.py --profile          # CPU + memory profile of each pipeline stage
         """
     )
     
@@ -29,6 +73,13 @@ Examples:
         help="Display name of user to roast (overrides config file)"
     )
     
+    parser.add_argument(
+        "--league-id",
+        type=str,
+        nargs="+",
+        help="Sleeper league ID(s) to report on (overrides config; several only with --all-users)"
+    )
+    
     parser.add_argument(
         "--list-users",
         action="store_true",
@@ -41,19 +92,163 @@ Examples:
         help="Directory to save report (overrides config)"
     )
     
+    parser.add_argument(
+        "--run-dir",
+        type=str,
+        help="Resume a specific checkpointed run directory"
+    )
+    
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Start a new run instead of resuming the latest unfinished one"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the report even if the league data hasn't changed since the last one"
+    )
+    
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Replay recorded model responses instead of calling Bedrock"
+    )
+    
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the model, ignoring recorded responses"
+    )
+    
+    parser.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Roast every manager in the league in one run and write an index page"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Reports generated concurrently in --all-users or --serve mode (overrides config)"
+    )
+    
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Run --all-users workers as separate processes sharing one mapped player table"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a local HTTP report service that keeps caches and agents warm between jobs"
+    )
+    
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Run the weekly scheduler: prefetch each completed week's data and generate reports"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port for --serve (overrides config)"
+    )
+    
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome trace-event timeline of the run (open in chrome://tracing or Perfetto)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU (cProfile) and memory (tracemalloc) per pipeline stage"
+    )
+    
     args = parser.parse_args()
     
+    config = get_config()
+    if args.trace:
+        tracer.enable()
+
     try:
-        config = get_config()
-        
         # Create output directory if specified
         if args.output_dir:
             Path(args.output_dir).mkdir(parents=True, exist_ok=True)
             config["output_dir"] = args.output_dir
         
+        if args.profile:
+            print(f"🔬 Profiling enabled - stage reports go to {profiler.enable(config['output_dir'])}")
+            # Load the player database up front so it gets a stage of its own
+            with stage("player_db_load"):
+                get_player_database()
+        
+        leagues = [
+            LeagueContext(league_id=league_id, target_display_name=config["target_display_name"])
+            for league_id in (args.league_id or [config["league_id"]])
+        ]
+        
+        # Fetch the player database and league data while the model client and agent are built
+        if config["background_warmup"]:
+            for league in leagues:
+                start_warmup(league)
+        
+        model_options = {
+            "backend": "replay" if args.offline else None,
+            "use_cache": False if args.no_llm_cache else None
+        }
+        model = build_model(**model_options)
+        
+        # Service mode keeps this process (and everything it has loaded) alive between reports
+        if args.serve:
+            from service import serve
+            serve(model=model, port=args.port, workers=args.workers, league_ids=args.league_id)
+            return
+        
+        # Scheduler mode sleeps until each configured weekly report time
+        if args.schedule:
+            from scheduler import WeeklyScheduler
+            WeeklyScheduler(leagues, model=model).run_forever()
+            return
+        
+        # Batch mode builds one agent per worker and shares league data between them
+        if args.all_users:
+            from batch import run_league_batch
+            print(f"🔥 Generating roast reports for {len(leagues)} league(s)...")
+            print("⚠️  Warning: No feelings will be spared in this process")
+            print()
+            
+            # Leagues run side by side, sharing the player database and HTTP connection pool
+            with ThreadPoolExecutor(max_workers=len(leagues)) as executor:
+                batches = list(executor.map(
+                    lambda league: run_league_batch(workers=args.workers, resume=not args.fresh, model=model,
+                                                    force=args.force, league=league,
+                                                    processes=args.processes or None,
+                                                    model_options=model_options),
+                    leagues
+                ))
+            
+            print()
+            for league, batch in zip(leagues, batches):
+                succeeded = sum(1 for r in batch["reports"] if r["success"])
+                print(f"✅ League {league.league_id}: {succeeded}/{len(batch['reports'])} roast reports generated")
+                print(f"📚 Index saved to: {batch['index_path']}")
+            return
+        
+        if len(leagues) > 1:
+            print("❌ Error: Several league IDs can only be used with --all-users")
+            sys.exit(1)
+        league = leagues[0]
+        set_current_league(league)
+        
         # Initialize the roast agent
         print("🤖 Initializing Fantasy Football Roast Agent...")
-        agent = FantasyFootballRoastAgent()
+        agent = FantasyFootballRoastAgent(model=model, league=league)
         
         # List users if requested
         if args.list_users:
@@ -72,7 +267,7 @@ Examples:
             return
         
         # Determine target user
-        target_user = args.target or config["target_display_name"]
+        target_user = args.target or league.target_display_name
         
         if not target_user or target_user == "your_target_here":
             print("❌ Error: No target user specified!")
@@ -81,7 +276,7 @@ Examples:
             sys.exit(1)
         
         print(f"🎯 Target: {target_user}")
-        print(f"🏆 League: {config['league_id']}")
+        print(f"🏆 League: {league.league_id}")
         print(f"📁 Output: {config['output_dir']}")
         print()
         
@@ -90,7 +285,9 @@ Examples:
         print("⚠️  Warning: No feelings will be spared in this process")
         print()
         
-        report_path = agent.generate_report(target_user)
+        report_path = agent.generate_report(
+            target_user, run_dir=args.run_dir, resume=not args.fresh, force=args.force
+        )
         
         print()
         print("✅ Roast report generated successfully!")
@@ -111,6 +308,14 @@ Examples:
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        print_token_usage(config)
+        write_metrics(config)
+        if args.profile:
+            print(f"🔬 Profile reports saved to: {profiler.write_summary()}")
+        if args.trace:
+            filename = f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            print(f"🧭 Trace saved to: {tracer.write(Path(config['output_dir']) / filename)}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
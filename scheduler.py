@@ -0,0 +1,207 @@
+"""Weekly Scheduler for Fantasy Football Roast Agent
+
+Runs in the background (run_roast.py --schedule) and generates each league's reports at
+the configured weekly times, typically the morning after Monday night football.
+SCHEDULE_PREFETCH_LEAD seconds before each report time it fetches everything those
+reports will need: a refreshed player database, the league, rosters, the completed
+week's matchups, trending players and injury searches. The Sleeper responses are pinned
+in the response cache so the reports start with everything already cached.
+
+Week boundaries come from get_nfl_state: each completed week is reported once per league
+(recorded per target in SCHEDULE_STATE_PATH, so restarts don't repeat a week and failed
+reports are retried at the next report time), and nothing runs outside the configured
+season types.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config import get_config
+from league_context import LeagueContext, use_league
+from sleeper_tools import (
+    get_all_rosters_with_users, get_league_info, get_matchup_data, get_nfl_state,
+    get_trending_players, pin_responses, record_responses, refresh_player_database
+)
+from web_tools import search_injury_reports
+from tracing import span
+import metrics
+
+config = get_config()
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def parse_schedule_time(value: str) -> Tuple[int, int, int]:
+    """"tue 09:30" -> (weekday, hour, minute) with Monday as 0"""
+    day, clock = value.lower().split()
+    hour, minute = clock.split(":")
+    return WEEKDAYS.index(day[:3]), int(hour), int(minute)
+
+
+def next_occurrence(value: str, after: datetime) -> datetime:
+    """The first local time strictly after `after` matching a "tue 09:30" schedule entry"""
+    weekday, hour, minute = parse_schedule_time(value)
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    candidate += timedelta(days=(weekday - after.weekday()) % 7)
+    if candidate <= after:
+        candidate += timedelta(days=7)
+    return candidate
+
+
+class WeeklyScheduler:
+    """Prefetches and generates every league's reports once per completed NFL week"""
+
+    def __init__(self, leagues: List[LeagueContext], model=None):
+        self.leagues = leagues
+        self.model = model
+        self.state_path = Path(config["schedule_state_path"])
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def _load_state(self) -> Dict[str, Dict[str, float]]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"reported": {}}
+
+    def _mark(self, kind: str, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self.state.setdefault(kind, {})[key] = time.time()
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.state_path)
+
+    def completed_week(self, league: LeagueContext) -> Optional[Tuple[str, int, int]]:
+        """(state key, completed week, current week) from NFL state, or None outside the season"""
+        with use_league(league):
+            nfl_state = get_nfl_state()
+        if not nfl_state["success"]:
+            print(f"⚠️  Schedule: couldn't get NFL state for league {league.league_id}")
+            return None
+        data = nfl_state["data"]
+        current_week = data.get("current_week") or 0
+        if data.get("season_type") not in config["schedule_season_types"] or current_week < 2:
+            print(f"💤 Schedule: no completed week to report on ({data.get('season_type')} week {current_week})")
+            return None
+        completed = current_week - 1
+        return f"{league.league_id}:{data.get('season')}:{completed}", completed, current_week
+
+    def upcoming(self, now: Optional[datetime] = None) -> List[Tuple[datetime, str, datetime]]:
+        """Next (run_at, "prefetch" | "report", report_at) events, soonest first"""
+        now = now or datetime.now()
+        lead = timedelta(seconds=config["schedule_prefetch_lead"])
+        events = []
+        for value in config["schedule_report_times"]:
+            report_at = next_occurrence(value, now)
+            if report_at - lead > now:
+                events.append((report_at - lead, "prefetch", report_at))
+            events.append((report_at, "report", report_at))
+        return sorted(events)
+
+    def _jitter(self) -> None:
+        self._stopping.wait(random.uniform(0, config["schedule_jitter"]))
+
+    def prefetch(self, league: LeagueContext, report_at: datetime) -> bool:
+        """Fetch and pin everything the completed week's reports will need"""
+        week = self.completed_week(league)
+        if week is None:
+            return False
+        key, completed, current_week = week
+        if key in self.state.get("reported", {}):
+            return False
+
+        print(f"📥 Schedule: prefetching week {completed} for league {league.league_id}...")
+        with record_responses() as urls, use_league(league), span("scheduled_prefetch", "run", track=f"{league.league_id}:prefetch",
+                                      league=league.league_id, week=completed):
+            refresh_player_database()
+            get_nfl_state()
+            get_league_info()
+            get_all_rosters_with_users()
+            get_matchup_data(completed)
+            get_matchup_data(current_week)
+            get_trending_players()
+            search_injury_reports()
+        pin_until = report_at.timestamp() + config["schedule_pin_seconds"]
+        pinned = pin_responses(urls, pin_until)
+        print(f"✅ Schedule: prefetched week {completed} ({pinned} responses cached until "
+              f"{datetime.fromtimestamp(pin_until):%a %H:%M})")
+        metrics.inc("roast_schedule_runs_total", kind="prefetch")
+        return True
+
+    def generate(self, league: LeagueContext) -> Optional[Dict[str, Any]]:
+        """Generate the completed week's reports for one league (once per week)"""
+        week = self.completed_week(league)
+        if week is None:
+            return None
+        key, completed, _ = week
+        if key in self.state.get("reported", {}):
+            print(f"✅ Schedule: week {completed} already reported for league {league.league_id}")
+            return None
+
+        # Targets already reported this week (by an earlier, partly failed run) are skipped
+        targets = config["schedule_targets"]
+        if targets is None:
+            with use_league(league):
+                league_info = get_league_info()
+            if league_info["success"]:
+                targets = [u.get("display_name") for u in league_info["data"]["users"] if u.get("display_name")]
+        if targets is not None:
+            targets = [t for t in targets if f"{key}:{t}" not in self.state.get("reported", {})]
+
+        from batch import run_league_batch
+        print(f"🔥 Schedule: generating week {completed} reports for league {league.league_id}...")
+        batch = run_league_batch(targets=targets, workers=config["schedule_workers"],
+                                 model=self.model, league=league)
+        metrics.inc("roast_schedule_runs_total", kind="report")
+
+        # Only successful reports count as done; the week is done once none failed
+        succeeded = [r["display_name"] for r in batch["reports"] if r["success"]]
+        failed = len(batch["reports"]) - len(succeeded)
+        self._mark("reported", *(f"{key}:{name}" for name in succeeded))
+        if failed:
+            print(f"⚠️  Schedule: {failed} week {completed} report(s) failed for league {league.league_id} "
+                  f"- they'll be retried at the next report time")
+            metrics.inc("roast_schedule_errors_total", failed, kind="report")
+        else:
+            self._mark("reported", key)
+        return batch
+
+    def _run_event(self, kind: str, report_at: datetime) -> None:
+        """Run one event for every league, each after its own random jitter"""
+        def run(league: LeagueContext) -> None:
+            self._jitter()
+            if self._stopping.is_set():
+                return
+            try:
+                if kind == "prefetch":
+                    self.prefetch(league, report_at)
+                else:
+                    self.generate(league)
+            except Exception as e:
+                print(f"❌ Schedule: {kind} failed for league {league.league_id}: {e}")
+                metrics.inc("roast_schedule_errors_total", kind=kind)
+
+        with ThreadPoolExecutor(max_workers=config["schedule_max_leagues"]) as executor:
+            list(executor.map(run, self.leagues))
+
+    def run_forever(self) -> None:
+        """Sleep until each scheduled event and run it; stops on KeyboardInterrupt or stop()"""
+        while not self._stopping.is_set():
+            run_at, kind, report_at = self.upcoming()[0]
+            print(f"⏰ Next scheduled {kind}: {run_at:%a %Y-%m-%d %H:%M} "
+                  f"(reports at {report_at:%a %H:%M}, {len(self.leagues)} league(s))")
+            if self._stopping.wait(max(0.0, (run_at - datetime.now()).total_seconds())):
+                break
+            self._run_event(kind, report_at)
+
+    def stop(self) -> None:
+        self._stopping.set()
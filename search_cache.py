@@ -0,0 +1,91 @@
+"""Persistent Web Search Cache for Fantasy Football Roast Agent"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config import get_config
+
+config = get_config()
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# Long-running processes (--serve, --schedule) re-purge expired entries this often (seconds)
+_PURGE_INTERVAL = 3600
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry.
+
+    Lowercases, drops punctuation and collapses whitespace. Term order is kept:
+    "Chiefs vs Bills" and "Bills vs Chiefs" are different searches.
+    """
+    return " ".join(_TOKEN_RE.findall(query.lower()))
+
+
+class SearchCache:
+    """SQLite-backed cache of search results keyed on normalized query.
+
+    Entries older than SEARCH_CACHE_MAX_STALE can never be served, even as a fallback,
+    so they are purged when the cache is opened and hourly after that.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config["search_cache_path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_results (
+                cache_key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                query TEXT NOT NULL,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._next_purge = 0.0
+        self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        self._next_purge = time.time() + _PURGE_INTERVAL
+        self.purge(config["search_cache_max_stale"])
+
+    @staticmethod
+    def key(query: str, max_results: int) -> str:
+        return f"{normalize_query(query)}|{max_results}"
+
+    def get(self, query: str, max_results: int) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Return (results, age in seconds) for a cached query, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, fetched_at FROM search_results WHERE cache_key = ?",
+                (self.key(query, max_results),)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def put(self, query: str, max_results: int, kind: str, results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (cache_key, kind, query, results, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.key(query, max_results), kind, query, json.dumps(results), time.time())
+            )
+            self._conn.commit()
+        if time.time() >= self._next_purge:
+            self._purge_expired()
+
+    def purge(self, max_age: float) -> int:
+        """Delete entries older than max_age seconds; returns how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM search_results WHERE fetched_at < ?", (time.time() - max_age,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
@@ -0,0 +1,258 @@
+"""Report Service for Fantasy Football Roast Agent
+
+A long-running local HTTP server (run_roast.py --serve) that accepts report jobs and
+works through them on a bounded pool of worker threads. Everything a cold CLI run pays
+for on every report - imports, the player database download, league data, the search
+cache, compiled Jinja templates, model client and agent construction - is paid once
+and stays warm between jobs.
+
+Endpoints:
+    POST /jobs           {"target": "...", "league_id": "...", "force": false} -> job
+                         (league_id must be one of the served leagues; defaults to the first)
+    GET  /jobs           all jobs, newest first
+    GET  /jobs/<id>      one job
+    GET  /health         queue and worker summary
+    GET  /metrics        Prometheus text (metrics.registry)
+    GET  /metrics.json   the same metrics as JSON
+"""
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config import get_config
+from league_context import LeagueContext
+from roast_agent import FantasyFootballRoastAgent
+from sleeper_tools import start_warmup
+import metrics
+
+config = get_config()
+
+
+@dataclass
+class ReportJob:
+    """One requested report and its progress"""
+
+    id: str
+    league_id: str
+    target: str
+    force: bool
+    status: str = "queued"  # queued -> running -> done | failed
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    report_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ReportService:
+    """Job queue with bounded concurrency and warm, reusable agents.
+
+    Submitting a job identical to one already queued or running (same league, target and
+    force flag) returns the existing job instead of adding another. Only the leagues the
+    service was started for are accepted, and only the newest SERVICE_MAX_JOBS finished
+    jobs are kept.
+    """
+
+    def __init__(self, model=None, workers: Optional[int] = None, league_ids: Optional[List[str]] = None):
+        self.model = model
+        self.workers = workers or config["service_workers"]
+        self.league_ids = list(league_ids or config["service_league_ids"] or [config["league_id"]])
+        self.jobs: Dict[str, ReportJob] = {}
+        self._active: Dict[Tuple[str, str, bool], str] = {}
+        self._leagues: Dict[str, LeagueContext] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report")
+        self._stopping = threading.Event()
+        threading.Thread(target=self._keep_warm, name="keep-warm", daemon=True).start()
+
+    def league(self, league_id: Optional[str] = None) -> LeagueContext:
+        """The service's context for a league; warm-up starts the first time a league is seen.
+        
+        Raises ValueError for a league the service doesn't serve.
+        """
+        league_id = str(league_id or self.league_ids[0])
+        if league_id not in self.league_ids:
+            raise ValueError(f"League {league_id} is not served here (serving: {', '.join(self.league_ids)})")
+        with self._lock:
+            league = self._leagues.get(league_id)
+            if league is None:
+                league = self._leagues[league_id] = LeagueContext(league_id=league_id)
+                start_warmup(league)
+        return league
+
+    def _keep_warm(self) -> None:
+        """Re-run the warm-up for every known league so its data is rarely stale when a job starts"""
+        while not self._stopping.wait(config["service_refresh_interval"]):
+            with self._lock:
+                leagues = list(self._leagues.values())
+            for league in leagues:
+                start_warmup(league)
+
+    def submit(self, target: str, league_id: Optional[str] = None, force: bool = False) -> Tuple[ReportJob, bool]:
+        """Queue a report; returns (job, created) where created is False for a deduplicated job"""
+        league = self.league(league_id)
+        key = (league.league_id, target.lower(), force)
+        with self._lock:
+            existing = self._active.get(key)
+            if existing:
+                metrics.inc("roast_service_jobs_total", status="deduplicated")
+                return self.jobs[existing], False
+            job = ReportJob(id=uuid.uuid4().hex[:12], league_id=league.league_id, target=target,
+                            force=force, created_at=time.time())
+            self.jobs[job.id] = job
+            self._active[key] = job.id
+            self._prune_jobs()
+        metrics.inc("roast_service_jobs_total", status="queued")
+        self._executor.submit(self._run, job, key)
+        return job, True
+
+    def _prune_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond SERVICE_MAX_JOBS (caller holds the lock)"""
+        finished = [job for job in self.jobs.values() if job.status in ("done", "failed")]
+        excess = len(finished) - config["service_max_jobs"]
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.created_at)[:excess]:
+                del self.jobs[job.id]
+
+    def _agent(self, league: LeagueContext) -> FantasyFootballRoastAgent:
+        """This worker thread's agent for the league, built on first use and then reused"""
+        agents = getattr(self._local, "agents", None)
+        if agents is None:
+            agents = self._local.agents = {}
+        if league.league_id not in agents:
+            agents[league.league_id] = FantasyFootballRoastAgent(model=self.model, league=league)
+        return agents[league.league_id]
+
+    def _run(self, job: ReportJob, key: Tuple[str, str, bool]) -> None:
+        job.started_at = time.time()
+        job.status = "running"
+        metrics.observe("roast_service_queue_wait_seconds", job.started_at - job.created_at)
+        try:
+            report_path = self._agent(self.league(job.league_id)).generate_report(job.target, force=job.force)
+            job.report_path = report_path
+            if "error_report_" in Path(report_path).name:
+                job.status, job.error = "failed", "Report generation failed (see error report)"
+            else:
+                job.status = "done"
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active.pop(key, None)
+                self._prune_jobs()
+            metrics.inc("roast_service_jobs_total", status=job.status)
+            metrics.observe("roast_service_job_seconds", job.finished_at - job.started_at)
+
+    def list_jobs(self) -> List[ReportJob]:
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def get_job(self, job_id: str) -> Optional[ReportJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def health(self) -> Dict[str, Any]:
+        jobs = self.list_jobs()
+        with self._lock:
+            warm_leagues = sorted(self._leagues)
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "leagues": self.league_ids,
+            "warm_leagues": warm_leagues,
+            "queued": sum(1 for j in jobs if j.status == "queued"),
+            "running": sum(1 for j in jobs if j.status == "running"),
+            "done": sum(1 for j in jobs if j.status == "done"),
+            "failed": sum(1 for j in jobs if j.status == "failed")
+        }
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP front end for a ReportService (set as the server's `service` attribute)"""
+
+    server_version = "RoastService/1.0"
+
+    def _send(self, status: int, body: Any, content_type: str = "application/json") -> None:
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        service: ReportService = self.server.service
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._send(200, service.health())
+        elif path == "/metrics":
+            self._send(200, metrics.registry.prometheus_text(), "text/plain; version=0.0.4")
+        elif path == "/metrics.json":
+            self._send(200, metrics.registry.snapshot())
+        elif path == "/jobs":
+            self._send(200, [asdict(job) for job in service.list_jobs()])
+        elif path.startswith("/jobs/"):
+            job = service.get_job(path[len("/jobs/"):])
+            if job:
+                self._send(200, asdict(job))
+            else:
+                self._send(404, {"error": "Job not found"})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        service: ReportService = self.server.service
+        if self.path.split("?", 1)[0].rstrip("/") != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "Request body must be JSON"})
+            return
+        target = request.get("target") if isinstance(request, dict) else None
+        if not target or not isinstance(target, str):
+            self._send(400, {"error": "'target' is required and must be a string"})
+            return
+        if not isinstance(request.get("league_id"), (str, type(None))):
+            self._send(400, {"error": "'league_id' must be a string"})
+            return
+        try:
+            job, created = service.submit(target, league_id=request.get("league_id"), force=bool(request.get("force")))
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(202 if created else 200, {**asdict(job), "deduplicated": not created})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Job progress is printed by the agent; skip per-request access logs
+
+
+def serve(model=None, host: Optional[str] = None, port: Optional[int] = None,
+          workers: Optional[int] = None, league_ids: Optional[List[str]] = None) -> None:
+    """Run the report service for the given leagues (default: SERVICE_LEAGUE_IDS) until interrupted"""
+    service = ReportService(model=model, workers=workers, league_ids=league_ids)
+    for league_id in service.league_ids:
+        service.league(league_id)  # Warm every served league before the first job arrives
+    server = ThreadingHTTPServer((host or config["service_host"], port or config["service_port"]), _Handler)
+    server.service = service
+    print(f"🛰️  Report service listening on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({service.workers} workers)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -1,72 +1,289 @@
 """Sleeper API Tools for Fantasy Football Roast Agent"""
 
+import contextvars
+import copy
+import re
 import requests
+import threading
 import time
 import json
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Any
 from strands import tool
 from config import get_config
+from resilience import RetryableError, CircuitOpenError, retry_call, hedged_call, get_breaker
+import metrics
+from tracing import span
+from league_context import LeagueContext, current_league, use_league
+from player_table import PlayerTableReader
 
 config = get_config()
 
-# Global player database cache
-_player_db = None
 
-def make_api_call(url: str, delay: float = None) -> Optional[Dict]:
-    """Make an API call with rate limiting"""
+class _PlayerTable(NamedTuple):
+    """Read-only snapshot of the player database plus precomputed display names"""
+    players: Mapping[str, Dict]
+    names: Mapping[str, str]
+
+
+# Player database, shared by every league in the process. It is published once as an
+# immutable snapshot, so lookups read the reference without taking a lock; the lock
+# only serialises loading so concurrent tools never download it twice.
+_player_table: Optional[_PlayerTable] = None
+_player_table_lock = threading.Lock()
+_player_table_failed_at = 0.0
+_EMPTY_PLAYERS: Mapping[str, Dict] = MappingProxyType({})
+
+# Short-lived response cache shared by every tool call (and every report) in the process.
+# Keyed by URL, so each league's data stays separate. Expired entries are kept as a
+# fallback for when the API is failing. Concurrent misses for the same URL share one
+# request through _inflight, and responses pinned by a scheduled prefetch stay fresh
+# until their _pinned_until time (expired pins are dropped when next looked up). All
+# three are guarded by _response_cache_lock.
+_response_cache: Dict[str, tuple] = {}
+_inflight: Dict[str, Future] = {}
+_pinned_until: Dict[str, float] = {}
+_response_cache_lock = threading.Lock()
+
+# Set by record_responses(): the URLs the current context has requested
+_recorded_urls: contextvars.ContextVar = contextvars.ContextVar("recorded_urls", default=None)
+
+# URL patterns for each configured endpoint, used to pick timeouts, hedging and breakers
+_ENDPOINT_PATTERNS = [
+    (name, re.compile("^" + re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(template)) + "$"))
+    for name, template in config["endpoints"].items()
+]
+
+def _endpoint_name(url: str) -> str:
+    """Map a request URL back to its configured endpoint name"""
+    path = url.split("?", 1)[0]
+    for name, pattern in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return name
+    return "default"
+
+def _fetch(url: str, endpoint: str) -> Any:
+    """Single GET with the endpoint's timeouts; transient failures raise RetryableError"""
+    timeout = config["endpoint_timeouts"].get(endpoint, config["endpoint_timeouts"]["default"])
+    try:
+        with span(f"GET {endpoint}", "http", url=url), metrics.timer("roast_http_request_seconds", endpoint=endpoint):
+            response = current_league().session.get(url, timeout=timeout)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        metrics.inc("roast_http_requests_total", endpoint=endpoint, status=type(e).__name__)
+        raise RetryableError(str(e)) from e
+    
+    metrics.inc("roast_http_requests_total", endpoint=endpoint, status=response.status_code)
+    metrics.inc("roast_http_response_bytes_total", len(response.content), endpoint=endpoint)
+    if response.status_code in config["retry_statuses"]:
+        raise RetryableError(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return response.json()
+
+def make_api_call(url: str, delay: float = None, use_cache: bool = True) -> Optional[Dict]:
+    """Make an API call with rate limiting, timeouts, retries and a circuit breaker.
+    
+    Repeats are served from the in-process cache and concurrent requests for the same
+    URL wait for a single fetch; if the request ultimately fails, a previously cached
+    (even expired) response is returned instead of None. Every caller gets its own copy,
+    so a tool editing its result can't change what later callers see.
+    """
+    recorded = _recorded_urls.get()
+    if recorded is not None:
+        recorded.add(url)
+    if not use_cache:
+        return _request(url, delay)
+    
+    with _response_cache_lock:
+        cached = _response_cache.get(url)
+        now = time.time()
+        pinned = _pinned_until.get(url, 0)
+        if pinned and pinned <= now:
+            del _pinned_until[url]
+        fresh = cached is not None and (now - cached[0] < config["api_cache_ttl"] or now < pinned)
+        if not fresh:
+            pending = _inflight.get(url)
+            leader = pending is None
+            if leader:
+                pending = _inflight[url] = Future()
+    
+    if fresh:
+        metrics.inc("roast_cache_requests_total", cache="sleeper", result="hit")
+        return copy.deepcopy(cached[1])
+    if not leader:
+        metrics.inc("roast_cache_requests_total", cache="sleeper", result="shared")
+        return copy.deepcopy(pending.result())
+    
+    metrics.inc("roast_cache_requests_total", cache="sleeper", result="miss")
+    try:
+        data = _request(url, delay)
+        if data is not None:
+            with _response_cache_lock:
+                _response_cache[url] = (time.time(), data)
+        elif cached:
+            print(f"♻️  Using cached response for {_endpoint_name(url)}")
+            metrics.inc("roast_cache_requests_total", cache="sleeper", result="stale")
+            data = cached[1]
+        pending.set_result(data)
+        return copy.deepcopy(data)
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _response_cache_lock:
+            _inflight.pop(url, None)
+
+def export_response_cache() -> Dict[str, tuple]:
+    """Copy of the response cache, to seed another process with already-fetched responses"""
+    with _response_cache_lock:
+        return dict(_response_cache)
+
+def import_response_cache(entries: Dict[str, tuple]) -> None:
+    """Add responses exported from another process (newer local entries win)"""
+    with _response_cache_lock:
+        for url, entry in entries.items():
+            if url not in _response_cache or _response_cache[url][0] < entry[0]:
+                _response_cache[url] = entry
+
+@contextmanager
+def record_responses() -> Iterator[Set[str]]:
+    """Collect the URLs of every API call made in this context (cache hits included)"""
+    urls: Set[str] = set()
+    token = _recorded_urls.set(urls)
+    try:
+        yield urls
+    finally:
+        _recorded_urls.reset(token)
+
+def pin_responses(urls: Iterable[str], until: float) -> int:
+    """Keep the cached responses for urls fresh until `until`; returns how many were pinned.
+    
+    Used by the weekly scheduler so data prefetched ahead of the report window (the URLs
+    collected by record_responses) is still served from cache when the reports run.
+    """
+    now = time.time()
+    with _response_cache_lock:
+        for url in [url for url, pinned in _pinned_until.items() if pinned <= now]:
+            del _pinned_until[url]
+        urls = [url for url in urls if url in _response_cache]
+        for url in urls:
+            _pinned_until[url] = max(_pinned_until.get(url, 0), until)
+    return len(urls)
+
+def _request(url: str, delay: float = None) -> Optional[Any]:
+    """One rate-limited, retried, circuit-broken request; None if it ultimately fails"""
     if delay is None:
         delay = config["rate_limit_delay"]
     
+    endpoint = _endpoint_name(url)
+    hedge_after = config["hedge_after"].get(endpoint)
+    
+    def attempt():
+        if hedge_after:
+            return hedged_call(lambda: _fetch(url, endpoint), hedge_after)
+        return _fetch(url, endpoint)
+    
     time.sleep(delay)
     try:
-        response = requests.get(url, headers={
-            'User-Agent': 'Fantasy Football Roast Agent',
-            'Accept': 'application/json'
-        })
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        with metrics.timer("roast_api_call_seconds", endpoint=endpoint):
+            data = get_breaker(f"sleeper:{endpoint}").call(lambda: retry_call(attempt), trip_on=(RetryableError,))
+    except (requests.exceptions.RequestException, RetryableError, CircuitOpenError, ValueError) as e:
         print(f"API Error for {url}: {e}")
+        metrics.inc("roast_api_errors_total", endpoint=endpoint, error=type(e).__name__)
         return None
+    return data
 
-def get_player_database() -> Dict[str, Dict]:
-    """Get and cache the full NFL player database"""
-    global _player_db
-    
-    if _player_db is None:
-        print("🔄 Loading NFL player database...")
-        url = config["endpoints"]["players"]
-        _player_db = make_api_call(url)
-        if _player_db:
-            print(f"✅ Loaded {len(_player_db)} players")
-        else:
-            print("❌ Failed to load player database")
-            _player_db = {}
-    
-    return _player_db
+def _display_name(player: Dict) -> Optional[str]:
+    first_name = player.get('first_name', '')
+    last_name = player.get('last_name', '')
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return last_name or None
+
+def _build_player_table(players: Dict[str, Dict]) -> _PlayerTable:
+    names = {pid: name for pid, name in ((pid, _display_name(p)) for pid, p in players.items()) if name}
+    return _PlayerTable(MappingProxyType(players), MappingProxyType(names))
+
+def _get_player_table() -> Optional[_PlayerTable]:
+    """The loaded player table, loading it on first use (one download however many threads ask).
+    
+    A failed load is not cached: callers get None until PLAYER_DB_RETRY_AFTER has passed,
+    then the next caller tries again.
+    """
+    global _player_table, _player_table_failed_at
+    
+    table = _player_table
+    if table is not None:
+        return table
+    
+    with _player_table_lock:
+        if _player_table is None and time.time() - _player_table_failed_at >= config["player_db_retry_after"]:
+            print("🔄 Loading NFL player database...")
+            # Held in the player table already; don't keep a second copy in the response cache
+            players = make_api_call(current_league().url("players"), use_cache=False)
+            if players:
+                _player_table = _build_player_table(players)
+                print(f"✅ Loaded {len(players)} players")
+            else:
+                _player_table_failed_at = time.time()
+                print(f"❌ Failed to load player database - retrying in {config['player_db_retry_after']}s")
+        return _player_table
+
+def get_player_database() -> Mapping[str, Dict]:
+    """Get the full NFL player database (read-only; empty while it can't be loaded)"""
+    table = _get_player_table()
+    return table.players if table is not None else _EMPTY_PLAYERS
+
+def attach_player_table(path: Optional[str] = None) -> None:
+    """Serve player lookups from a shared player table file instead of downloading the database.
+    
+    Used by process-pool workers: the parent publishes the table once (player_table.py)
+    and every worker maps the same file read-only.
+    """
+    global _player_table
+    reader = PlayerTableReader(path)
+    with _player_table_lock:
+        _player_table = _PlayerTable(reader, reader.names)
+
+def refresh_player_database() -> bool:
+    """Download a fresh player database and swap it in.
+    
+    Lookups keep using the current copy while the download runs, and if it fails.
+    """
+    global _player_table, _player_table_failed_at
+    print("🔄 Refreshing NFL player database...")
+    players = make_api_call(current_league().url("players"), use_cache=False)
+    if not players:
+        print("❌ Player database refresh failed - keeping the current copy")
+        return False
+    table = _build_player_table(players)
+    with _player_table_lock:
+        _player_table = table
+        _player_table_failed_at = 0.0
+    print(f"✅ Refreshed {len(players)} players")
+    return True
+
+def reset_player_database() -> None:
+    """Drop the loaded player database so the next lookup downloads a fresh copy"""
+    global _player_table, _player_table_failed_at
+    with _player_table_lock:
+        _player_table = None
+        _player_table_failed_at = 0.0
 
 def get_player_name(player_id: str) -> str:
     """Get player name from ID, handling team defenses"""
     if len(player_id) <= 3 and player_id.isupper():
         return f"{player_id} Defense"
     
-    players = get_player_database()
-    player = players.get(player_id, {})
-    
-    first_name = player.get('first_name', '')
-    last_name = player.get('last_name', '')
-    
-    if first_name and last_name:
-        return f"{first_name} {last_name}"
-    elif last_name:
-        return last_name
-    else:
-        return f"Player {player_id}"
+    table = _get_player_table()
+    name = table.names.get(player_id) if table is not None else None
+    return name or f"Player {player_id}"
 
 @tool
 def get_nfl_state() -> Dict[str, Any]:
     """Get current NFL season state and week information"""
-    url = config["endpoints"]["nfl_state"]
+    url = current_league().url("nfl_state")
     nfl_state = make_api_call(url)
     
     if nfl_state:
@@ -85,17 +302,17 @@ def get_nfl_state() -> Dict[str, Any]:
 @tool
 def get_league_info() -> Dict[str, Any]:
     """Get comprehensive league information including settings and users"""
-    league_id = config["league_id"]
+    league = current_league()
     
     # Get league details
-    league_url = config["endpoints"]["league"].format(league_id=league_id)
+    league_url = league.url("league")
     league_data = make_api_call(league_url)
     
     if not league_data:
         return {"success": False, "error": "Failed to get league data"}
     
     # Get league users
-    users_url = config["endpoints"]["league_users"].format(league_id=league_id)
+    users_url = league.url("league_users")
     users_data = make_api_call(users_url)
     
     if not users_data:
@@ -134,8 +351,7 @@ def get_team_data(display_name: str) -> Dict[str, Any]:
         return {"success": False, "error": f"User '{display_name}' not found in league"}
     
     # Get rosters
-    league_id = config["league_id"]
-    rosters_url = config["endpoints"]["league_rosters"].format(league_id=league_id)
+    rosters_url = current_league().url("league_rosters")
     rosters_data = make_api_call(rosters_url)
     
     if not rosters_data:
@@ -201,8 +417,7 @@ def get_team_data(display_name: str) -> Dict[str, Any]:
 @tool
 def get_matchup_data(week: int) -> Dict[str, Any]:
     """Get matchup data for a specific week"""
-    league_id = config["league_id"]
-    matchups_url = config["endpoints"]["league_matchups"].format(league_id=league_id, week=week)
+    matchups_url = current_league().url("league_matchups", week=week)
     matchups_data = make_api_call(matchups_url)
     
     if not matchups_data:
@@ -219,8 +434,9 @@ def get_matchup_data(week: int) -> Dict[str, Any]:
 @tool
 def get_trending_players() -> Dict[str, Any]:
     """Get trending add/drop players with names"""
-    adds_url = config["endpoints"]["trending_adds"] + f"?limit={config['max_waiver_targets']}"
-    drops_url = config["endpoints"]["trending_drops"] + f"?limit={config['max_waiver_targets']}"
+    league = current_league()
+    adds_url = league.url("trending_adds") + f"?limit={config['max_waiver_targets']}"
+    drops_url = league.url("trending_drops") + f"?limit={config['max_waiver_targets']}"
     
     trending_adds = make_api_call(adds_url)
     trending_drops = make_api_call(drops_url)
@@ -262,14 +478,14 @@ def get_draft_analysis(draft_id: str) -> Dict[str, Any]:
         return {"success": False, "error": "No draft ID provided"}
     
     # Get draft info
-    draft_url = config["endpoints"]["draft"].format(draft_id=draft_id)
+    draft_url = current_league().url("draft", draft_id=draft_id)
     draft_data = make_api_call(draft_url)
     
     if not draft_data:
         return {"success": False, "error": "Failed to get draft data"}
     
     # Get draft picks
-    picks_url = config["endpoints"]["draft_picks"].format(draft_id=draft_id)
+    picks_url = current_league().url("draft_picks", draft_id=draft_id)
     picks_data = make_api_call(picks_url)
     
     if not picks_data:
@@ -302,8 +518,7 @@ def get_draft_analysis(draft_id: str) -> Dict[str, Any]:
 @tool
 def calculate_league_averages() -> Dict[str, Any]:
     """Calculate league-wide averages for comparison"""
-    league_id = config["league_id"]
-    rosters_url = config["endpoints"]["league_rosters"].format(league_id=league_id)
+    rosters_url = current_league().url("league_rosters")
     rosters_data = make_api_call(rosters_url)
     
     if not rosters_data:
@@ -335,8 +550,7 @@ def get_all_rosters_with_users() -> Dict[str, Any]:
         if not league_info["success"]:
             return {"success": False, "error": "Failed to get league info"}
         
-        league_id = config["league_id"]
-        rosters_url = config["endpoints"]["league_rosters"].format(league_id=league_id)
+        rosters_url = current_league().url("league_rosters")
         rosters_data = make_api_call(rosters_url)
         
         if not rosters_data:
@@ -430,4 +644,56 @@ def get_player_details(player_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        return {"success": False, "error": f"Failed to get player details: {str(e)}"} 
\ No newline at end of file
+        return {"success": False, "error": f"Failed to get player details: {str(e)}"}
+
+def prefetch_league_data() -> Dict[str, Any]:
+    """Warm the shared caches with the league-wide data every report needs.
+    
+    Used by batch runs so all targets share one fetch of the league, users, rosters,
+    trending players, recent matchups and the player database.
+    """
+    print("🔄 Prefetching shared league data...")
+    get_player_database()
+    nfl_state = get_nfl_state()
+    league_info = get_league_info()
+    calculate_league_averages()
+    get_trending_players()
+    
+    if nfl_state["success"] and nfl_state["data"].get("current_week"):
+        current_week = nfl_state["data"]["current_week"]
+        get_matchup_data(current_week)
+        if current_week > 1:
+            get_matchup_data(current_week - 1)
+    
+    if league_info["success"] and league_info["data"].get("draft_id"):
+        get_draft_analysis(league_info["data"]["draft_id"])
+    
+    return league_info
+
+# Background warm-up threads (see start_warmup)
+_warmup_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="warmup")
+
+def start_warmup(league: Optional[LeagueContext] = None) -> List[Future]:
+    """Start loading the player database, NFL state and league snapshot in the background.
+    
+    Returns immediately so the caller can build the model client and agent meanwhile.
+    Nothing waits on the warm-up as a whole: a tool that needs one of these pieces before
+    it has arrived joins the in-flight download (single-flight player table and response
+    cache), and tools that don't need it never block.
+    """
+    league = league or current_league()
+    
+    def warm(name: str, fn) -> None:
+        with use_league(league), span(f"warmup:{name}", "phase"):
+            try:
+                fn()
+            except Exception as e:
+                print(f"⚠️  Warm-up of {name} failed: {e}")
+    
+    tasks = {
+        "player_db": _get_player_table,
+        "nfl_state": lambda: make_api_call(league.url("nfl_state")),
+        "league": lambda: (make_api_call(league.url("league")), make_api_call(league.url("league_users"))),
+        "rosters": lambda: make_api_call(league.url("league_rosters")),
+    }
+    return [_warmup_executor.submit(warm, name, fn) for name, fn in tasks.items()]
@@ -0,0 +1,154 @@
+"""Search Snippet Post-Processing for Fantasy Football Roast Agent
+
+Deduplicates, ranks and trims search results before they reach the model context.
+"""
+
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from config import get_config
+
+config = get_config()
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_AGO_RE = re.compile(r"\b(\d+)\s+(minute|hour|day|week)s?\s+ago\b", re.IGNORECASE)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "to", "in", "on", "for", "vs", "is", "at", "by", "with",
+    "nfl", "fantasy", "football", "news", "week", "season", "analysis"
+}
+
+# MinHash parameters: NUM_PERM (a, b) pairs for h(x) = (a * x + b) mod MERSENNE_PRIME
+NUM_PERM = 64
+MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % MERSENNE_PRIME or 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """MinHash signature of a text's word 3-shingles"""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+              for s in _shingles(text)]
+    if not hashes:
+        return [MERSENNE_PRIME] * NUM_PERM
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(sig1: List[int], sig2: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / NUM_PERM
+
+
+def _age_hours(result: Dict[str, Any]) -> Optional[float]:
+    """Best-effort age of a result from its date field or an "N hours ago" snippet"""
+    date = result.get("date")
+    if date:
+        try:
+            published = datetime.fromisoformat(str(date).replace("Z", "+00:00"))
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            return (datetime.now(timezone.utc) - published).total_seconds() / 3600
+        except ValueError:
+            pass
+
+    match = _AGO_RE.search(f"{result.get('title', '')} {result.get('snippet', '')}")
+    if match:
+        hours_per_unit = {"minute": 1 / 60, "hour": 1, "day": 24, "week": 168}
+        return int(match.group(1)) * hours_per_unit[match.group(2).lower()]
+    return None
+
+
+def _relevance(result: Dict[str, Any], focus_terms: set) -> float:
+    if not focus_terms:
+        return 0.0
+    title_terms = set(_WORD_RE.findall(result.get("title", "").lower()))
+    body_terms = set(_WORD_RE.findall(result.get("snippet", "").lower()))
+    # Title matches count double; normalized so a full match in both scores 1.0
+    return (2 * len(focus_terms & title_terms) + len(focus_terms & body_terms)) / (3 * len(focus_terms))
+
+
+def _trim(text: str, max_tokens: int) -> str:
+    """Trim text to roughly max_tokens, preferring a sentence boundary"""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundaries = [m.start() for m in _SENTENCE_END_RE.finditer(cut)]
+    if boundaries and boundaries[-1] > max_chars // 2:
+        return cut[:boundaries[-1]]
+    return cut.rsplit(" ", 1)[0] + "…"
+
+
+def _result_tokens(result: Dict[str, Any]) -> int:
+    return estimate_tokens(" ".join(str(v) for v in result.values()))
+
+
+def process_results(results: List[Dict[str, Any]], focus: str,
+                    token_budget: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Deduplicate, rank and trim formatted search results.
+
+    Near-duplicates (syndicated copies) are dropped with MinHash over word shingles,
+    the rest are ranked by relevance to `focus` and recency, then trimmed to fit the
+    token budget. Returns the processed results and token accounting.
+    """
+    token_budget = token_budget or config["snippet_token_budget"]
+    original_tokens = sum(_result_tokens(r) for r in results)
+
+    # 1. Near-duplicate removal (keep the first, usually the higher-ranked source)
+    kept, signatures = [], []
+    for result in results:
+        signature = minhash(f"{result.get('title', '')} {result.get('snippet', '')}")
+        if any(similarity(signature, seen) >= config["snippet_dedup_threshold"] for seen in signatures):
+            continue
+        kept.append(result)
+        signatures.append(signature)
+
+    # 2. Rank by relevance, then recency (unknown ages rank as neutral)
+    focus_terms = set(_WORD_RE.findall(focus.lower())) - STOPWORDS
+
+    def score(item: Tuple[int, Dict[str, Any]]) -> Tuple[float, int]:
+        position, result = item
+        age = _age_hours(result)
+        recency = 0.5 if age is None else 1 / (1 + age / 24)
+        return (_relevance(result, focus_terms) + 0.5 * recency, -position)
+
+    ranked = [r for _, r in sorted(enumerate(kept), key=score, reverse=True)]
+
+    # 3. Fit to the token budget, trimming the last snippet that only partly fits
+    processed, used = [], 0
+    for result in ranked:
+        tokens = _result_tokens(result)
+        if used + tokens <= token_budget:
+            processed.append(result)
+            used += tokens
+            continue
+        remaining = token_budget - used - (tokens - estimate_tokens(result.get("snippet", "")))
+        if remaining >= 20:
+            trimmed = {**result, "snippet": _trim(result.get("snippet", ""), remaining)}
+            processed.append(trimmed)
+            used += _result_tokens(trimmed)
+        break
+
+    return processed, {
+        "duplicates_removed": len(results) - len(kept),
+        "original_tokens": original_tokens,
+        "final_tokens": used,
+        "tokens_saved": original_tokens - used
+    }
@@ -105,6 +105,162 @@ def test_web_search():
         print(f"  ❌ Web search error: {e}")
         return False
 
+def test_player_lookup_concurrency():
+    """Stress test: many threads resolving player names while the database loads"""
+    print("\n🧵 Testing concurrent player lookups...")
+
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    import sleeper_tools
+
+    players = {str(i): {"first_name": f"First{i}", "last_name": f"Last{i}"} for i in range(5000)}
+    downloads = []
+    fail_first = [True]
+
+    def fake_download(url, delay=None, use_cache=True):
+        downloads.append(url)
+        time.sleep(0.2)  # Long enough for every thread to pile up on the first lookup
+        if fail_first[0]:
+            fail_first[0] = False
+            return None
+        return players
+
+    original_download = sleeper_tools.make_api_call
+    original_retry_after = sleeper_tools.config["player_db_retry_after"]
+    sleeper_tools.make_api_call = fake_download
+    sleeper_tools.reset_player_database()
+    try:
+        # First load fails: lookups degrade to "Player <id>" and the failure isn't cached forever
+        sleeper_tools.config["player_db_retry_after"] = 0.5
+        if sleeper_tools.get_player_name("7") != "Player 7" or len(downloads) != 1:
+            print("  ❌ Failed load was not handled")
+            return False
+        time.sleep(0.5)
+
+        start = threading.Barrier(32)
+
+        def hammer(worker):
+            start.wait()
+            for i in range(worker, 5000, 7):
+                if sleeper_tools.get_player_name(str(i)) != f"First{i} Last{i}":
+                    return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(hammer, range(32)))
+
+        if not all(results):
+            print("  ❌ Wrong player names under concurrency")
+            return False
+        if len(downloads) != 2:
+            print(f"  ❌ Player database downloaded {len(downloads)} times (expected 2)")
+            return False
+        print("  ✅ 32 threads shared one player database download")
+        print("  ✅ Failed download retried instead of cached")
+        return True
+    finally:
+        sleeper_tools.make_api_call = original_download
+        sleeper_tools.config["player_db_retry_after"] = original_retry_after
+        sleeper_tools.reset_player_database()
+
+class _FakeSession:
+    """Stands in for a league's requests.Session, recording the URLs it was asked for"""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        from types import SimpleNamespace
+        self.urls.append(url)
+        return SimpleNamespace(status_code=200, content=b"[]", json=lambda: [], raise_for_status=lambda: None)
+
+def test_trace_nesting():
+    """Test that tool spans nest in their model turn and HTTP spans in their tool"""
+    print("\n🧭 Testing trace span nesting...")
+
+    import asyncio
+    from types import SimpleNamespace
+    import sleeper_tools
+    from league_context import LeagueContext, use_league
+    from tracing import TracingHooks, span, tracer
+
+    hooks = TracingHooks()
+    agent = object()
+    tool_uses = [{"toolUseId": f"t{i}", "name": "get_team_data", "input": {}} for i in range(2)]
+
+    async def run_tool(tool_use):
+        # Mirrors strands: hooks fire in the tool's task, the tool body runs in asyncio.to_thread
+        hooks.before_tool(SimpleNamespace(agent=agent, tool_use=tool_use))
+        await asyncio.to_thread(_http_call)
+        hooks.after_tool(SimpleNamespace(agent=agent, tool_use=tool_use, exception=None))
+
+    def _http_call():
+        # league_rosters is a hedged endpoint, so the request runs on the hedge pool
+        sleeper_tools.make_api_call(league.url("league_rosters"), delay=0, use_cache=False)
+
+    league = LeagueContext(league_id="trace", session=_FakeSession())
+
+    async def invocation():
+        hooks.before_model(SimpleNamespace(agent=agent))
+        hooks.after_model(SimpleNamespace(agent=agent, stop_response=SimpleNamespace(stop_reason="tool_use")))
+        await asyncio.gather(*(run_tool(tool_use) for tool_use in tool_uses))
+        hooks.after_invocation(SimpleNamespace(agent=agent))
+
+    was_enabled = tracer.enabled
+    tracer.enable()
+    try:
+        with use_league(league), span("generate_report", "run", track="league:target"):
+            asyncio.run(invocation())
+        events = list(tracer._events)
+    finally:
+        tracer.enabled = was_enabled
+
+    by_name = {}
+    for event in events:
+        by_name.setdefault(event["name"], []).append(event)
+    turn = by_name["model_turn"][0]
+    tools = by_name["tool:get_team_data"]
+    http = by_name.get("GET league_rosters", [])
+
+    if any(tool["args"]["parent_id"] != turn["args"]["span_id"] for tool in tools):
+        print("  ❌ Tool span is not a child of its model turn")
+        return False
+    tool_ids = {tool["args"]["span_id"] for tool in tools}
+    if len(http) != 2 or {h["args"]["parent_id"] for h in http} != tool_ids:
+        print("  ❌ HTTP span is not a child of its tool")
+        return False
+    if len({event["pid"] for event in events}) != 1:
+        print("  ❌ Spans of one run are spread over several tracks")
+        return False
+    if tools[0]["tid"] == tools[1]["tid"]:
+        print("  ❌ Concurrent tool spans share one lane")
+        return False
+    print("  ✅ Tool spans nest in their model turn, HTTP spans in their tool")
+    return True
+
+def test_hedged_request_league():
+    """Test that a hedged Sleeper request uses the league set by use_league"""
+    print("\n🏟️  Testing league context on hedged requests...")
+
+    import sleeper_tools
+    from league_context import LeagueContext, use_league
+
+    other = LeagueContext(league_id="other", session=_FakeSession())
+    url = other.url("league_users")
+    if not sleeper_tools.config["hedge_after"].get(sleeper_tools._endpoint_name(url)):
+        print("  ❌ league_users is no longer hedged - pick a hedged endpoint")
+        return False
+
+    with use_league(other):
+        sleeper_tools.make_api_call(url, delay=0, use_cache=False)
+
+    if other.session.urls != [url]:
+        print("  ❌ Hedged request did not use the league's session")
+        return False
+    print("  ✅ Hedged request ran under its league's context")
+    return True
+
 def test_files():
     """Test that required files exist"""
     print("\n📁 Testing files...")
@@ -116,6 +272,8 @@ def test_files():
         "roast_agent.py",
         "run_roast.py",
         "report_template.html",
+        "index_template.html",
+        "report.css",
         "requirements.txt"
     ]
     
@@ -146,6 +304,9 @@ def main():
         ("Imports", test_imports),
         ("Configuration", test_config),
         ("Sleeper API", test_sleeper_api),
+        ("Player Lookup Concurrency", test_player_lookup_concurrency),
+        ("Trace Nesting", test_trace_nesting),
+        ("Hedged Request League", test_hedged_request_league),
         ("Web Search", test_web_search)
     ]
     
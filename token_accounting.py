@@ -0,0 +1,202 @@
+"""Token and Cost Accounting for Fantasy Football Roast Agent
+
+Records input/output tokens for every model turn, attributed to the report target and
+section being written, and estimates how much of each turn's input came from each
+tool's results sitting in the conversation. Costs come from the MODEL_PRICES table.
+Turns served from the LLM response cache (or the offline replay model) carry their
+recorded usage but cost nothing; they are reported on a separate "cache_hit" line.
+"""
+
+import contextvars
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from strands.hooks import AfterModelCallEvent, BeforeModelCallEvent, HookProvider, HookRegistry
+from config import get_config
+from snippet_processing import estimate_tokens
+
+config = get_config()
+
+# Set by the agent around each report/section; copied into the agent's worker thread
+_target: contextvars.ContextVar = contextvars.ContextVar("usage_target", default=None)
+_section: contextvars.ContextVar = contextvars.ContextVar("usage_section", default=None)
+
+
+@contextmanager
+def attribute_to(target: Optional[str] = None, section: Optional[str] = None) -> Iterator[None]:
+    """Attribute model turns made inside the block to a report target and/or section"""
+    tokens = []
+    if target is not None:
+        tokens.append((_target, _target.set(target)))
+    if section is not None:
+        tokens.append((_section, _section.set(section)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_attribution() -> Tuple[Optional[str], Optional[str]]:
+    """The (target, section) model turns in this context are attributed to"""
+    return _target.get(), _section.get()
+
+
+def estimate_cost(model_id: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """Estimated USD cost from the per-million-token price table, or None if the model isn't listed"""
+    prices = config["model_prices"].get(model_id)
+    if prices is None:
+        return None
+    return (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+
+
+def _tool_context_tokens(messages: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Estimated tokens of the tool results in a conversation, per tool name"""
+    names, totals = {}, {}
+    for message in messages:
+        for block in message.get("content", []):
+            if "toolUse" in block:
+                names[block["toolUse"]["toolUseId"]] = block["toolUse"]["name"]
+            elif "toolResult" in block:
+                result = block["toolResult"]
+                name = names.get(result["toolUseId"], "unknown")
+                size = sum(estimate_tokens(c["text"]) if "text" in c else estimate_tokens(json.dumps(c, default=str))
+                           for c in result.get("content", []))
+                totals[name] = totals.get(name, 0) + size
+    return totals
+
+
+class TokenLedger:
+    """Process-wide record of model turns and their token usage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns: List[Dict[str, Any]] = []
+
+    def record(self, turn: Dict[str, Any]) -> None:
+        with self._lock:
+            self.turns.append(turn)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.turns = []
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return the recorded turns (batch workers send them to the parent)"""
+        with self._lock:
+            turns, self.turns = self.turns, []
+        return turns
+
+    def merge(self, turns: List[Dict[str, Any]]) -> None:
+        """Add turns recorded by another process"""
+        with self._lock:
+            self.turns.extend(turns)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals of billed turns overall, per (target, section) and per tool (tokens of its
+        results re-sent as input), plus the replayed turns as a zero-cost "cache_hit" line"""
+        with self._lock:
+            turns = [turn for turn in self.turns if not turn.get("cached")]
+            cached = [turn for turn in self.turns if turn.get("cached")]
+
+        def totals(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+            input_tokens = sum(r["input_tokens"] for r in rows)
+            output_tokens = sum(r["output_tokens"] for r in rows)
+            costs = [r["cost"] for r in rows]
+            return {
+                "turns": len(rows),
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost": None if any(c is None for c in costs) else round(sum(costs), 4)
+            }
+
+        sections: Dict[str, List[Dict[str, Any]]] = {}
+        tools: Dict[str, int] = {}
+        for turn in turns:
+            key = f"{turn['target'] or '-'} / {turn['section'] or '-'}"
+            sections.setdefault(key, []).append(turn)
+            for tool_name, tokens in turn["tool_context_tokens"].items():
+                tools[tool_name] = tools.get(tool_name, 0) + tokens
+
+        return {
+            "total": totals(turns),
+            "cache_hit": totals(cached),
+            "sections": {key: totals(rows) for key, rows in sections.items()},
+            "tool_context_tokens": dict(sorted(tools.items(), key=lambda item: item[1], reverse=True))
+        }
+
+    def format_summary(self, top_tools: int = 8) -> str:
+        """Plain-text tables for the end of a run"""
+        summary = self.summary()
+
+        def cost(value: Optional[float]) -> str:
+            return "n/a" if value is None else f"${value:.4f}"
+
+        lines = [f"{'Target / section':<45} {'Turns':>6} {'Input':>10} {'Output':>8} {'Cost':>10}"]
+        rows = list(summary["sections"].items())
+        if summary["cache_hit"]["turns"]:
+            rows.append(("cache_hit (replayed, not billed)", summary["cache_hit"]))
+        for key, row in rows + [("TOTAL", summary["total"])]:
+            lines.append(f"{key[:45]:<45} {row['turns']:>6} {row['input_tokens']:>10,} "
+                         f"{row['output_tokens']:>8,} {cost(row['cost']):>10}")
+
+        if summary["tool_context_tokens"]:
+            lines.append("")
+            lines.append(f"{'Tool results re-sent as input (est.)':<45} {'Tokens':>10}")
+            for tool_name, tokens in list(summary["tool_context_tokens"].items())[:top_tools]:
+                lines.append(f"{tool_name[:45]:<45} {tokens:>10,}")
+        return "\n".join(lines)
+
+    def write_json(self, path: Path) -> str:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            turns = list(self.turns)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "turns": turns}, f, indent=2)
+        return str(path)
+
+
+ledger = TokenLedger()
+
+
+class UsageHooks(HookProvider):
+    """Agent hooks recording each model turn's token usage into the ledger"""
+
+    def __init__(self, model_id: Optional[str] = None):
+        self.model_id = model_id or config["model_id"]
+        self._context: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, self.before_model)
+        registry.add_callback(AfterModelCallEvent, self.after_model)
+
+    def before_model(self, event: BeforeModelCallEvent) -> None:
+        context = _tool_context_tokens(event.agent.messages)
+        with self._lock:
+            self._context[id(event.agent)] = context
+
+    def after_model(self, event: AfterModelCallEvent) -> None:
+        with self._lock:
+            context = self._context.pop(id(event.agent), {})
+        if event.stop_response is None:
+            return
+        metadata = event.stop_response.message.get("metadata", {})
+        usage = metadata.get("usage", {})
+        input_tokens = usage.get("inputTokens", 0)
+        output_tokens = usage.get("outputTokens", 0)
+        cached = bool(metadata.get("metrics", {}).get("cached"))
+        ledger.record({
+            "target": _target.get(),
+            "section": _section.get(),
+            "model_id": self.model_id,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": 0.0 if cached else estimate_cost(self.model_id, input_tokens, output_tokens),
+            "cached": cached,
+            "stop_reason": event.stop_response.stop_reason,
+            "tool_context_tokens": context
+        })
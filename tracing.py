@@ -0,0 +1,271 @@
+"""Span Tracing for Fantasy Football Roast Agent
+
+Records nested spans (run -> phase -> model turn -> tool call -> HTTP request) as
+Chrome trace events. Load the written JSON in chrome://tracing or https://ui.perfetto.dev
+to see which calls overlap, which run serially and where the agent sits idle.
+Tracing is off unless enabled (run_roast.py --trace); disabled spans cost almost nothing.
+
+Every span records its parent's span ID. The innermost open span is held in a context
+variable, which strands and asyncio.to_thread copy into the threads that run tools, so
+an HTTP request made inside a tool is parented to that tool no matter which worker
+thread it runs on. Spans are laid out by run rather than by OS thread: each top-level
+span starts a track (the report target, e.g. "league:target"), shown as one process
+row in the viewer, and children stay on their parent's track. A child shares its
+parent's lane (row) unless a sibling is already open there, in which case it gets a
+lane of its own - concurrent tool calls sit side by side instead of on top of each other.
+"""
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from strands.hooks import (
+    AfterInvocationEvent, AfterModelCallEvent, AfterToolCallEvent, BeforeModelCallEvent,
+    BeforeToolCallEvent, HookProvider, HookRegistry
+)
+
+
+@dataclass
+class _Span:
+    """One open span"""
+
+    id: int
+    parent_id: Optional[int]
+    name: str
+    category: str
+    track: str
+    lane: int
+    start: float
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_INHERIT = object()
+
+
+def current_span() -> Optional[_Span]:
+    """The innermost open span in this context, if any"""
+    return _current_span.get()
+
+
+class Tracer:
+    """Collects complete ("X") trace events from every thread in the process"""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._tracks: Dict[str, int] = {}
+        self._lanes: Dict[str, List[List[int]]] = {}  # track -> per-lane stacks of open span IDs
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter()
+        self._origin_wall = time.time()
+
+    def enable(self) -> None:
+        with self._lock:
+            self.enabled = True
+            self._events.clear()
+            self._tracks.clear()
+            self._lanes.clear()
+            self._origin = time.perf_counter()
+            self._origin_wall = time.time()
+
+    def now(self) -> float:
+        """Microseconds since tracing was enabled"""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def start(self, name: str, category: str = "roast", parent: Any = _INHERIT,
+              track: Optional[str] = None, **args: Any) -> Optional[_Span]:
+        """Open a span (child of the context's current span unless parent is given); None when disabled.
+
+        A span without a parent starts on `track`, or on the current thread's track.
+        """
+        if not self.enabled:
+            return None
+        if parent is _INHERIT:
+            parent = _current_span.get()
+        if parent is not None:
+            track = parent.track
+        track = track or threading.current_thread().name
+        with self._lock:
+            self._tracks.setdefault(track, len(self._tracks) + 1)
+            lanes = self._lanes.setdefault(track, [])
+            lane = None
+            if parent is not None and parent.lane < len(lanes) and lanes[parent.lane][-1:] == [parent.id]:
+                lane = parent.lane
+            else:
+                lane = next((i for i, stack in enumerate(lanes) if not stack), None)
+            if lane is None:
+                lanes.append([])
+                lane = len(lanes) - 1
+            span_id = next(self._ids)
+            lanes[lane].append(span_id)
+        return _Span(span_id, parent.id if parent else None, name, category, track, lane, self.now(), args)
+
+    def finish(self, span: Optional[_Span], **args: Any) -> None:
+        """Close a span from start() and record it"""
+        if span is None:
+            return
+        end = self.now()
+        args = {"span_id": span.id, "parent_id": span.parent_id, **span.args, **args}
+        event = {"name": span.name, "cat": span.category, "ph": "X", "ts": round(span.start, 1),
+                 "dur": round(end - span.start, 1), "tid": span.lane,
+                 "args": {k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                          for k, v in args.items()}}
+        with self._lock:
+            lanes = self._lanes.get(span.track, [])
+            if span.lane < len(lanes) and span.id in lanes[span.lane]:
+                lanes[span.lane].remove(span.id)
+            if not self.enabled or span.track not in self._tracks:
+                return
+            event["pid"] = self._tracks[span.track]
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = "roast", track: Optional[str] = None, **args: Any) -> Iterator[None]:
+        """Time the wrapped block as a child of the current span"""
+        opened = self.start(name, category, track=track, **args)
+        if opened is None:
+            yield
+            return
+        token = _current_span.set(opened)
+        error = {}
+        try:
+            yield
+        except BaseException as e:
+            error["error"] = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(opened, **error)
+
+    def drain(self) -> Dict[str, Any]:
+        """Remove and return the finished spans, for merging into another process's tracer"""
+        with self._lock:
+            names = {pid: track for track, pid in self._tracks.items()}
+            events, self._events = self._events, []
+        return {"origin": self._origin_wall,
+                "events": [{**event, "pid": names[event["pid"]]} for event in events]}
+
+    def merge(self, drained: Dict[str, Any]) -> None:
+        """Add spans drained from another process (e.g. a batch worker) to this trace.
+
+        Timestamps are shifted onto this tracer's clock and span IDs renumbered so they
+        can't collide with this process's spans; each worker span keeps its track.
+        """
+        if not self.enabled:
+            return
+        shift = (drained["origin"] - self._origin_wall) * 1e6
+        ids: Dict[int, int] = {}
+        with self._lock:
+            for event in drained["events"]:
+                args = dict(event.get("args", {}))
+                for field_name in ("span_id", "parent_id"):
+                    if args.get(field_name) is not None:
+                        if args[field_name] not in ids:
+                            ids[args[field_name]] = next(self._ids)
+                        args[field_name] = ids[args[field_name]]
+                track = event["pid"]
+                pid = self._tracks.setdefault(track, len(self._tracks) + 1)
+                lanes = self._lanes.setdefault(track, [])
+                lanes.extend([] for _ in range(event["tid"] + 1 - len(lanes)))
+                self._events.append({**event, "pid": pid, "ts": round(event["ts"] + shift, 1), "args": args})
+
+    def write(self, path: Path) -> str:
+        """Write the collected spans as Chrome trace-event JSON"""
+        with self._lock:
+            metadata = []
+            for track, pid in self._tracks.items():
+                metadata.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                                 "args": {"name": track}})
+                for lane in range(len(self._lanes.get(track, []))):
+                    metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": lane,
+                                     "args": {"name": f"lane {lane}"}})
+            trace = {"traceEvents": metadata + sorted(self._events, key=lambda e: e["ts"]),
+                     "displayTimeUnit": "ms", "otherData": {"pid": os.getpid()}}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return str(path)
+
+
+tracer = Tracer()
+
+
+def span(name: str, category: str = "roast", track: Optional[str] = None, **args: Any):
+    return tracer.span(name, category, track=track, **args)
+
+
+class TracingHooks(HookProvider):
+    """Agent hooks turning each model turn and tool call into a span.
+
+    A model turn lasts from one model call to the next (or to the end of the
+    invocation), so it contains both the model call and the tool calls it asked for.
+    Tool spans become the current span of the task that runs the tool, which carries
+    over into the tool's worker thread and parents any HTTP or search spans there.
+    """
+
+    def __init__(self):
+        self._turns: Dict[int, _Span] = {}
+        self._model_calls: Dict[int, _Span] = {}
+        self._tools: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, self.before_model)
+        registry.add_callback(AfterModelCallEvent, self.after_model)
+        registry.add_callback(BeforeToolCallEvent, self.before_tool)
+        registry.add_callback(AfterToolCallEvent, self.after_tool)
+        registry.add_callback(AfterInvocationEvent, self.after_invocation)
+
+    def before_model(self, event: BeforeModelCallEvent) -> None:
+        if not tracer.enabled:
+            return
+        with self._lock:
+            previous = self._turns.pop(id(event.agent), None)
+        tracer.finish(previous)
+        turn = tracer.start("model_turn", "model")
+        call = tracer.start("model_call", "model", parent=turn)
+        with self._lock:
+            self._turns[id(event.agent)] = turn
+            self._model_calls[id(event.agent)] = call
+
+    def after_model(self, event: AfterModelCallEvent) -> None:
+        with self._lock:
+            call = self._model_calls.pop(id(event.agent), None)
+        stop = event.stop_response.stop_reason if event.stop_response else "error"
+        tracer.finish(call, stop_reason=stop)
+
+    def before_tool(self, event: BeforeToolCallEvent) -> None:
+        if not tracer.enabled:
+            return
+        with self._lock:
+            turn = self._turns.get(id(event.agent))
+        tool_span = tracer.start(f"tool:{event.tool_use['name']}", "tool",
+                                 parent=turn if turn is not None else _current_span.get(),
+                                 input=json.dumps(event.tool_use.get("input", {}), default=str)[:200])
+        with self._lock:
+            self._tools[event.tool_use["toolUseId"]] = (tool_span, _current_span.get())
+        _current_span.set(tool_span)
+
+    def after_tool(self, event: AfterToolCallEvent) -> None:
+        with self._lock:
+            opened = self._tools.pop(event.tool_use["toolUseId"], None)
+        if opened:
+            tool_span, outer = opened
+            tracer.finish(tool_span, **({"error": type(event.exception).__name__} if event.exception else {}))
+            _current_span.set(outer)
+
+    def after_invocation(self, event: AfterInvocationEvent) -> None:
+        with self._lock:
+            turn = self._turns.pop(id(event.agent), None)
+            call = self._model_calls.pop(id(event.agent), None)
+        tracer.finish(call, stop_reason="error")
+        tracer.finish(turn)
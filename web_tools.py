@@ -1,197 +1,429 @@
 """Web Search Tools for Fantasy Football Roast Agent"""
 
-from typing import Dict, List, Any
+import atexit
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from strands import tool
 from ddgs import DDGS
+from ddgs.exceptions import RatelimitException, TimeoutException
 from config import get_config
+from sleeper_tools import get_nfl_state
+from league_context import current_league
+from search_cache import SearchCache
+from resilience import RetryableError, get_breaker, retry_call
+from news_index import get_news_index
+from snippet_processing import process_results
+import metrics
+from tracing import span
 
 config = get_config()
 
+
+class SearchClient:
+    """Process-wide web search client.
+
+    Every query runs on a bounded thread pool, so the process holds at most one
+    long-lived DDGS session per pool worker (all closed by close()) however many
+    threads the agent's tool calls arrive on. Each search provider is rate limited so batches don't trip provider
+    throttling. Results are cached on disk with a per-kind TTL; when the provider errors
+    or rate-limits, a stale cached result is served instead of failing.
+    """
+
+    def __init__(self, max_workers: int, rate_limits: Dict[str, float], backend: str = "auto",
+                 cache: Optional[SearchCache] = None):
+        self.backend = backend
+        self.rate_limits = rate_limits
+        self.cache = cache
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-search")
+        self._local = threading.local()
+        self._rate_lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+        self._sessions: List[DDGS] = []
+
+    def _session(self) -> DDGS:
+        if not hasattr(self._local, "ddgs"):
+            self._local.ddgs = DDGS(timeout=config["web_search_timeout"])
+            with self._stats_lock:
+                self._sessions.append(self._local.ddgs)
+        return self._local.ddgs
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _wait_for_slot(self, provider: str) -> None:
+        """Reserve the provider's next request slot and sleep until it arrives"""
+        interval = self.rate_limits.get(provider, 0)
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(provider, now))
+            self._next_slot[provider] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _run(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Search with timeout, jittered retries on throttling, and a per-provider circuit breaker"""
+        def attempt():
+            self._wait_for_slot(self.backend)
+            try:
+                with span("search", "search", query=query), metrics.timer("roast_search_seconds", backend=self.backend):
+                    results = list(self._session().text(
+                        query,
+                        max_results=max_results,
+                        region="us-en",
+                        backend=self.backend
+                    ))
+            except Exception as e:
+                metrics.inc("roast_search_requests_total", backend=self.backend, status=type(e).__name__)
+                if isinstance(e, (RatelimitException, TimeoutException)):
+                    raise RetryableError(str(e)) from e
+                raise
+            metrics.inc("roast_search_requests_total", backend=self.backend, status="success")
+            return results
+
+        breaker = get_breaker(f"search:{self.backend}")
+        return breaker.call(lambda: retry_call(attempt), trip_on=(RetryableError,))
+
+    def _cached_run(self, query: str, max_results: int, kind: str) -> List[Dict[str, Any]]:
+        """Serve a fresh cached result, else search and cache, falling back to stale on error"""
+        cached = self.cache.get(query, max_results) if self.cache else None
+        ttl = config["search_cache_ttls"].get(kind, config["search_cache_ttls"]["default"])
+        if cached and cached[1] < ttl:
+            self._count("hits")
+            metrics.inc("roast_cache_requests_total", cache="search", result="hit")
+            return cached[0]
+
+        self._count("misses")
+        metrics.inc("roast_cache_requests_total", cache="search", result="miss")
+        try:
+            results = self._run(query, max_results)
+        except Exception:
+            if cached and cached[1] < config["search_cache_max_stale"]:
+                self._count("stale")
+                metrics.inc("roast_cache_requests_total", cache="search", result="stale")
+                return cached[0]
+            raise
+
+        if results and self.cache:
+            self.cache.put(query, max_results, kind, results)
+        if results and config["news_index_enabled"]:
+            try:
+                get_news_index().add(query, results)
+            except Exception as e:
+                print(f"⚠️  Could not index search results: {e}")
+        return results
+
+    def _submit(self, query: str, max_results: int, kind: str):
+        # Each query runs in a copy of the caller's context so league and trace span carry over
+        return self._executor.submit(contextvars.copy_context().run, self._cached_run, query, max_results, kind)
+
+    def search(self, query: str, max_results: int, kind: str = "default") -> List[Dict[str, Any]]:
+        """Run a single query on the pool (tool calls each arrive on a fresh thread, so running
+        on the caller's thread would build a new DDGS session per call)"""
+        return self._submit(query, max_results, kind).result()
+
+    def search_many(self, queries: List[str], max_results: int, kind: str = "default") -> List[Any]:
+        """Run queries concurrently; each entry is a result list or the exception it raised"""
+        futures = [self._submit(query, max_results, kind) for query in queries]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def close(self) -> None:
+        """Shut down the pool and close every thread's DDGS session"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._stats_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.__exit__(None, None, None)
+
+
+_search_client: Optional[SearchClient] = None
+_search_client_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Get the shared search client, creating it on first use"""
+    global _search_client
+
+    with _search_client_lock:
+        if _search_client is None:
+            _search_client = SearchClient(
+                max_workers=config["web_search_workers"],
+                rate_limits=config["web_search_rate_limits"],
+                backend=config["web_search_backend"],
+                cache=SearchCache() if config["search_cache_enabled"] else None
+            )
+            atexit.register(_search_client.close)
+    return _search_client
+
+
+def _format_results(results: List[Dict[str, Any]], focus: str) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+    """Format raw search results for the agent, deduplicated, ranked and trimmed for `focus`"""
+    formatted_results = []
+    for result in results:
+        formatted = {
+            "title": result.get("title", ""),
+            "snippet": result.get("body", ""),
+            "url": result.get("href", ""),
+            "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
+        }
+        if result.get("date"):
+            formatted["date"] = result["date"]
+        formatted_results.append(formatted)
+    return process_results(formatted_results, focus)
+
+
+_search_context: Optional[Dict[str, Any]] = None
+_search_context_lock = threading.Lock()
+
+
+def get_search_context() -> Dict[str, Any]:
+    """Current season and week for query templates, fetched from NFL state and cached for the run.
+
+    A failed fetch falls back to the league's season with no week, and is retried after
+    SEARCH_CONTEXT_RETRY_AFTER seconds rather than kept for the full TTL.
+    """
+    global _search_context
+
+    with _search_context_lock:
+        if _search_context is None or time.time() >= _search_context["expires_at"]:
+            nfl_state = get_nfl_state()
+            data = nfl_state.get("data", {}) if nfl_state["success"] else {}
+            ttl = config["search_context_ttl"] if nfl_state["success"] else config["search_context_retry_after"]
+            _search_context = {
+                "season": data.get("season") or current_league().season,
+                "week": data.get("current_week") or "",
+                "expires_at": time.time() + ttl
+            }
+        return _search_context
+
+
+def build_query(kind: str, **params: Any) -> str:
+    """Build a search query from the template registry for the current season and week.
+
+    The same kind and params always produce the same query within a week, so the
+    query doubles as a stable cache key across managers.
+    """
+    context = get_search_context()
+    template = config["search_query_templates"][kind]
+    if not context["week"]:
+        # Unknown week (e.g. NFL state unavailable) - drop the week rather than guess
+        template = template.replace("week {week}", "")
+    query = template.format(season=context["season"], week=context["week"], **params)
+    return " ".join(query.split())
+
+
 @tool
 def search_player_news(player_name: str) -> Dict[str, Any]:
     """Search for recent news about a specific NFL player"""
     if not player_name or player_name.startswith("Player "):
         return {"success": False, "error": "Invalid player name provided"}
-    
-    # Create search query for fantasy football specific news
-    query = f"{player_name} NFL fantasy football news injury status 2025"
-    
+
+    query = build_query("player_news", player_name=player_name)
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query, 
-                max_results=config["web_search_results"],
-                region="us-en"
-            ))
-        
+        results = get_search_client().search(query, config["web_search_results"], kind="player_news")
+
         if not results:
             return {"success": False, "error": f"No news found for {player_name}"}
-        
-        # Filter and format results
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", ""),
-                "snippet": result.get("body", ""),
-                "url": result.get("href", ""),
-                "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
-            })
-        
+
+        formatted, stats = _format_results(results, player_name)
         return {
             "success": True,
             "data": {
                 "player_name": player_name,
                 "query": query,
-                "results": formatted_results
+                "results": formatted,
+                "tokens_saved": stats["tokens_saved"]
             }
         }
-    
+
     except Exception as e:
         return {"success": False, "error": f"Search error for {player_name}: {str(e)}"}
 
+@tool
+def search_roster_news(player_names: List[str]) -> Dict[str, Any]:
+    """Search for recent news about several NFL players at once (e.g. a whole roster).
+
+    Much faster than calling search_player_news once per player.
+    """
+    valid_names = [name for name in player_names if name and not name.startswith("Player ")]
+    if not valid_names:
+        return {"success": False, "error": "No valid player names provided"}
+
+    queries = [build_query("player_news", player_name=name) for name in valid_names]
+    outcomes = get_search_client().search_many(queries, config["web_search_results"], kind="player_news")
+
+    players = []
+    tokens_saved = 0
+    for name, query, outcome in zip(valid_names, queries, outcomes):
+        if isinstance(outcome, Exception):
+            players.append({"player_name": name, "success": False, "error": f"Search error: {str(outcome)}"})
+        elif not outcome:
+            players.append({"player_name": name, "success": False, "error": f"No news found for {name}"})
+        else:
+            formatted, stats = _format_results(outcome, name)
+            tokens_saved += stats["tokens_saved"]
+            players.append({
+                "player_name": name,
+                "success": True,
+                "query": query,
+                "results": formatted
+            })
+
+    if not any(p["success"] for p in players):
+        return {"success": False, "error": "No news found for any requested player"}
+
+    return {
+        "success": True,
+        "data": {
+            "players": players,
+            "tokens_saved": tokens_saved
+        }
+    }
+
+@tool
+def search_stored_news(topic: str, player_name: str = "", team: str = "") -> Dict[str, Any]:
+    """Search news snippets already collected in earlier searches and reports (local, instant).
+
+    Try this before the web search tools. Optionally restrict to one player (full name)
+    or one NFL team (abbreviation like "BUF").
+    """
+    try:
+        index = get_news_index()
+        player_id = None
+        if player_name:
+            player_id = index.find_player_id(player_name)
+            if player_id is None:
+                # Unknown name - fall back to matching it as text
+                topic = f"{topic} {player_name}"
+
+        results = index.search(topic, player_id=player_id, team=team or None,
+                               limit=config["web_search_results"])
+        if not results:
+            return {"success": False, "error": "No stored news found - try a web search tool"}
+
+        processed, stats = process_results(results, f"{topic} {player_name}")
+        return {
+            "success": True,
+            "data": {
+                "topic": topic,
+                "player_name": player_name,
+                "team": team,
+                "results": processed,
+                "tokens_saved": stats["tokens_saved"]
+            }
+        }
+
+    except Exception as e:
+        return {"success": False, "error": f"Stored news search error: {str(e)}"}
+
 @tool
 def search_fantasy_trends() -> Dict[str, Any]:
     """Search for current fantasy football trends and waiver wire targets"""
-    query = "fantasy football week 2 waiver wire targets 2025 NFL trending players"
-    
+    query = build_query("fantasy_trends")
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query,
-                max_results=config["web_search_results"],
-                region="us-en"
-            ))
-        
+        results = get_search_client().search(query, config["web_search_results"], kind="fantasy_trends")
+
         if not results:
             return {"success": False, "error": "No fantasy trends found"}
-        
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", ""),
-                "snippet": result.get("body", ""),
-                "url": result.get("href", ""),
-                "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
-            })
-        
+
+        formatted, stats = _format_results(results, query)
         return {
             "success": True,
             "data": {
                 "query": query,
-                "results": formatted_results
+                "results": formatted,
+                "tokens_saved": stats["tokens_saved"]
             }
         }
-    
+
     except Exception as e:
         return {"success": False, "error": f"Fantasy trends search error: {str(e)}"}
 
 @tool
 def search_team_analysis(team_name: str) -> Dict[str, Any]:
     """Search for analysis about a specific fantasy team or NFL team"""
-    query = f"{team_name} fantasy football analysis 2025 NFL season outlook"
-    
+    query = build_query("team_analysis", team_name=team_name)
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query,
-                max_results=3,  # Smaller number for team-specific searches
-                region="us-en"
-            ))
-        
+        # Smaller number for team-specific searches
+        results = get_search_client().search(query, 3, kind="team_analysis")
+
         if not results:
             return {"success": False, "error": f"No analysis found for {team_name}"}
-        
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", ""),
-                "snippet": result.get("body", ""),
-                "url": result.get("href", ""),
-                "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
-            })
-        
+
+        formatted, stats = _format_results(results, team_name)
         return {
             "success": True,
             "data": {
                 "team_name": team_name,
                 "query": query,
-                "results": formatted_results
+                "results": formatted,
+                "tokens_saved": stats["tokens_saved"]
             }
         }
-    
+
     except Exception as e:
         return {"success": False, "error": f"Team analysis search error for {team_name}: {str(e)}"}
 
 @tool
 def search_trade_analysis(player1: str, player2: str) -> Dict[str, Any]:
     """Search for trade analysis between two players"""
-    query = f"{player1} vs {player2} fantasy football trade analysis value comparison 2025"
-    
+    query = build_query("trade_analysis", player1=player1, player2=player2)
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query,
-                max_results=3,
-                region="us-en"
-            ))
-        
+        results = get_search_client().search(query, 3, kind="trade_analysis")
+
         if not results:
             return {"success": False, "error": f"No trade analysis found for {player1} vs {player2}"}
-        
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", ""),
-                "snippet": result.get("body", ""),
-                "url": result.get("href", ""),
-                "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
-            })
-        
+
+        formatted, stats = _format_results(results, f"{player1} {player2}")
         return {
             "success": True,
             "data": {
                 "player1": player1,
                 "player2": player2,
                 "query": query,
-                "results": formatted_results
+                "results": formatted,
+                "tokens_saved": stats["tokens_saved"]
             }
         }
-    
+
     except Exception as e:
         return {"success": False, "error": f"Trade analysis search error: {str(e)}"}
 
 @tool
 def search_injury_reports() -> Dict[str, Any]:
     """Search for current NFL injury reports"""
-    query = "NFL injury report week 2 2025 fantasy football impact"
-    
+    query = build_query("injury_reports")
+
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query,
-                max_results=config["web_search_results"],
-                region="us-en"
-            ))
-        
+        results = get_search_client().search(query, config["web_search_results"], kind="injury_reports")
+
         if not results:
             return {"success": False, "error": "No injury reports found"}
-        
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", ""),
-                "snippet": result.get("body", ""),
-                "url": result.get("href", ""),
-                "source": result.get("href", "").split("//")[-1].split("/")[0] if result.get("href") else ""
-            })
-        
+
+        formatted, stats = _format_results(results, query)
         return {
             "success": True,
             "data": {
                 "query": query,
-                "results": formatted_results
+                "results": formatted,
+                "tokens_saved": stats["tokens_saved"]
             }
         }
-    
+
     except Exception as e:
-        return {"success": False, "error": f"Injury report search error: {str(e)}"} 
\ No newline at end of file
+        return {"success": False, "error": f"Injury report search error: {str(e)}"}